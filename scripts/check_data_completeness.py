@@ -8,7 +8,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.services.news.pipeline import create_news_pipeline_orchestrator
-from src.config import get_google_settings
+from src.config import reset_settings_cache
 from dotenv import load_dotenv
 
 
@@ -24,7 +24,7 @@ def check_data_completeness():
     local_service_account_path = ".config/google_service_account.json"
     if os.path.exists(local_service_account_path):
         os.environ['GOOGLE_SERVICE_ACCOUNT_PATH'] = local_service_account_path
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     # Создаем оркестратор
     orchestrator = create_news_pipeline_orchestrator(
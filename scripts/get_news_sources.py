@@ -10,7 +10,7 @@ from typing import List, Dict, Any
 # Добавляем корневую папку в путь для импорта модулей
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.config import get_news_providers_settings, get_google_settings
+from src.config import get_news_providers_settings, reset_settings_cache
 from src.services.news.fetcher_fabric import FetcherFactory
 from src.services.news.exporter import create_google_sheets_exporter
 from src.logger import setup_logger
@@ -146,9 +146,7 @@ def update_google_sheets(results: Dict[str, str], provider_name: str):
     """
     try:
         # Очищаем кэш настроек, чтобы подхватить локальную переменную окружения
-        from src.config import get_settings
-        get_settings.cache_clear()
-        get_google_settings.cache_clear()
+        reset_settings_cache()
         
         # Создаем exporter напрямую с локальными настройками
         exporter = create_google_sheets_exporter(worksheet_name="Источники")
@@ -272,7 +270,7 @@ def main():
         os.environ['GOOGLE_SERVICE_ACCOUNT_PATH'] = local_service_account_path
         print(f"🔧 Используем локальный service account: {local_service_account_path}")
         # Очищаем кэш настроек, чтобы подхватить новую переменную
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     logger = setup_logger(__name__)
     
@@ -15,7 +15,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.services.news.exporter import GoogleSheetsExporter
 from src.langchain.news_chain import NewsItem
 from src.logger import setup_logger
-from src.config import get_google_settings
+from src.config import reset_settings_cache
 from dotenv import load_dotenv
 
 
@@ -85,7 +85,7 @@ def test_google_sheets_export():
         print(f"🔧 Используем локальный service account: {local_service_account_path}")
     
         # Очищаем кэш настроек, чтобы подхватить новую переменную
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     # Проверяем наличие необходимых переменных
     required_vars = [
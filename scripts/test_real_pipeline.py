@@ -10,7 +10,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.services.news.pipeline import create_news_pipeline_orchestrator
-from src.config import get_google_settings
+from src.config import reset_settings_cache
 from dotenv import load_dotenv
 
 
@@ -29,7 +29,7 @@ def test_real_pipeline():
         print(f"🔧 Используем локальный service account: {local_service_account_path}")
     
         # Очищаем кэш настроек, чтобы подхватить новую переменную
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     # Проверяем наличие .env файла
     env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
@@ -165,7 +165,7 @@ def test_components_individually():
     if os.path.exists(local_service_account_path):
         os.environ['GOOGLE_SERVICE_ACCOUNT_PATH'] = local_service_account_path
         # Очищаем кэш настроек, чтобы подхватить новую переменную
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     try:
         orchestrator = create_news_pipeline_orchestrator()
@@ -17,7 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.services.news.rubrics_config import get_rubrics_config, get_active_rubrics
 from src.services.news.pipeline import create_news_pipeline_orchestrator
-from src.config import get_google_settings
+from src.config import reset_settings_cache
 from dotenv import load_dotenv
 
 
@@ -59,7 +59,7 @@ def setup_environment():
         print(f"🔧 Используем локальный service account: {local_service_account_path}")
         
         # Очищаем кэш настроек, чтобы подхватить новую переменную
-        get_google_settings.cache_clear()
+        reset_settings_cache()
     
     # Проверяем наличие .env файла
     env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
@@ -1,169 +1,184 @@
 # src/config.py
 import os
-from functools import lru_cache
-from typing import Optional, Dict, List, Union
-from pydantic import BaseModel, Field
+import threading
+import time
+from typing import Annotated, Any, Callable, Literal, Optional, Dict, List, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class BaseProviderSettings(BaseModel):
     """Базовые настройки для всех провайдеров новостей"""
-    enabled: bool = Field(default=True, description="Включен ли провайдер")
-    priority: int = Field(default=1, description="Приоритет провайдера (1 - высший)")
-    max_retries: int = Field(default=3, description="Максимальное количество попыток")
-    backoff_factor: float = Field(default=2.0, description="Коэффициент backoff для повторных попыток")
-    timeout: int = Field(default=30, description="Таймаут запроса в секундах")
+    enabled: bool = True  # Включен ли провайдер
+    priority: int = 1  # Приоритет провайдера (1 - высший)
+    max_retries: int = 3  # Максимальное количество попыток
+    backoff_factor: float = 2.0  # Коэффициент backoff для повторных попыток
+    timeout: int = 30  # Таймаут запроса в секундах
+
+    # Настройки не изменяются после создания: экземпляры кэшируются и разделяются
+    model_config = ConfigDict(frozen=True)
 
 
 class TheNewsAPISettings(BaseProviderSettings):
     """Настройки для TheNewsAPI.com провайдера"""
-    api_token: str = Field(..., description="API токен для TheNewsAPI")
-    base_url: str = Field(default="https://api.thenewsapi.com/v1", description="Базовый URL API")
+    provider_kind: Literal["thenewsapi_com"] = "thenewsapi_com"
+    api_token: str  # API токен для TheNewsAPI
+    base_url: str = "https://api.thenewsapi.com/v1"  # Базовый URL API
     # Убираем все дефолтные значения для языков и категорий
-    headlines_per_category: int = Field(default=6, description="Количество заголовков на категорию")
+    headlines_per_category: int = 6  # Количество заголовков на категорию
 
 
 class NewsAPISettings(BaseProviderSettings):
     """Настройки для NewsAPI.org провайдера"""
-    api_key: str = Field(..., description="API ключ для NewsAPI.org")
-    base_url: str = Field(default="https://newsapi.org/v2", description="Базовый URL API")
+    provider_kind: Literal["newsapi_org"] = "newsapi_org"
+    api_key: str  # API ключ для NewsAPI.org
+    base_url: str = "https://newsapi.org/v2"  # Базовый URL API
     # Убираем все дефолтные значения для языков, стран и категорий
-    page_size: int = Field(default=100, description="Размер страницы результатов")
+    page_size: int = 100  # Размер страницы результатов
 
 
 class NewsDataIOSettings(BaseProviderSettings):
     """Настройки для NewsData.io провайдера"""
-    api_key: str = Field(..., description="API ключ для NewsData.io")
-    base_url: str = Field(default="https://newsdata.io/api/1", description="Базовый URL API")
+    provider_kind: Literal["newsdata_io"] = "newsdata_io"
+    api_key: str  # API ключ для NewsData.io
+    base_url: str = "https://newsdata.io/api/1"  # Базовый URL API
     # Убираем все дефолтные значения для языков, стран и категорий
-    page_size: int = Field(default=10, description="Размер страницы результатов")
+    page_size: int = 10  # Размер страницы результатов
 
 
 class MediaStackSettings(BaseProviderSettings):
     """Настройки для MediaStack провайдера"""
-    access_key: str = Field(..., description="Access key для MediaStack API")
-    base_url: str = Field(default="https://api.mediastack.com/v1", description="Базовый URL API")
-    page_size: int = Field(default=25, description="Размер страницы результатов")
+    provider_kind: Literal["mediastack_com"] = "mediastack_com"
+    access_key: str  # Access key для MediaStack API
+    base_url: str = "https://api.mediastack.com/v1"  # Базовый URL API
+    page_size: int = 25  # Размер страницы результатов
 
 
 class GNewsIOSettings(BaseProviderSettings):
     """Настройки для GNews.io провайдера"""
-    api_key: str = Field(..., description="API ключ для GNews.io")
-    base_url: str = Field(default="https://gnews.io/api/v4", description="Базовый URL API")
-    page_size: int = Field(default=100, description="Размер страницы результатов")
+    provider_kind: Literal["gnews_io"] = "gnews_io"
+    api_key: str  # API ключ для GNews.io
+    base_url: str = "https://gnews.io/api/v4"  # Базовый URL API
+    page_size: int = 100  # Размер страницы результатов
+
+
+# Настройки любого из поддерживаемых провайдеров новостей
+ProviderSettings = Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]
+# Tagged union: pydantic выбирает класс по provider_kind, не перебирая все варианты
+_DiscriminatedProviderSettings = Annotated[ProviderSettings, Field(discriminator="provider_kind")]
+
+
+def _provider_priority(item: tuple[str, ProviderSettings]) -> int:
+    """Ключ сортировки пар (имя, настройки) по приоритету провайдера"""
+    return item[1].priority
 
 
 class NewsProvidersSettings(BaseModel):
     """Настройки всех новостных провайдеров"""
-    providers: Dict[str, Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]] = Field(
-        default_factory=dict,
-        description="Словарь провайдеров новостей"
-    )
-    default_provider: str = Field(
-        default="thenewsapi_com",
-        description="Провайдер по умолчанию"
-    )
-    fallback_providers: List[str] = Field(
-        default_factory=list,
-        description="Список провайдеров для fallback в порядке приоритета"
-    )
+    # Словарь провайдеров новостей
+    providers: Dict[str, _DiscriminatedProviderSettings] = Field(default_factory=dict)
+    default_provider: str = "thenewsapi_com"  # Провайдер по умолчанию
+    # Список провайдеров для fallback в порядке приоритета
+    fallback_providers: List[str] = Field(default_factory=list)
+
+    model_config = ConfigDict(frozen=True)
     
-    def get_provider_settings(self, provider_name: str) -> Optional[Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]]:
+    # Кэш производных коллекций: провайдеры не меняются после построения настроек
+    _enabled_cache: Optional[Dict[str, ProviderSettings]] = PrivateAttr(default=None)
+    _by_priority_cache: Optional[List[tuple[str, ProviderSettings]]] = PrivateAttr(default=None)
+
+    def get_provider_settings(self, provider_name: str) -> Optional[ProviderSettings]:
         """Получить настройки конкретного провайдера"""
         return self.providers.get(provider_name)
     
-    def get_enabled_providers(self) -> Dict[str, Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]]:
-        """Получить только включенные провайдеры"""
-        return {name: settings for name, settings in self.providers.items() if settings.enabled}
+    def get_enabled_providers(self) -> Dict[str, ProviderSettings]:
+        """Получить только включенные провайдеры (результат кэшируется, не изменять)"""
+        if self._enabled_cache is None:
+            self._enabled_cache = {
+                name: settings for name, settings in self.providers.items() if settings.enabled
+            }
+        return self._enabled_cache
     
-    def get_providers_by_priority(self) -> List[tuple[str, Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]]]:
-        """Получить провайдеры отсортированные по приоритету"""
-        enabled = self.get_enabled_providers()
-        return sorted(enabled.items(), key=lambda x: x[1].priority)
+    def get_providers_by_priority(self) -> List[tuple[str, ProviderSettings]]:
+        """Получить провайдеры отсортированные по приоритету (результат кэшируется, не изменять)"""
+        if self._by_priority_cache is None:
+            enabled = self.get_enabled_providers()
+            self._by_priority_cache = sorted(enabled.items(), key=_provider_priority)
+        return self._by_priority_cache
 
 
 class AISettings(BaseModel):
     """Настройки для AI/LLM модулей"""
-    OPENAI_API_KEY: str = Field(..., description="API ключ OpenAI")
-    OPENAI_MODEL: str = Field(default="gpt-4o-mini", description="Модель OpenAI для обработки")
-    OPENAI_EMBEDDING_MODEL: str = Field(default="text-embedding-3-small", description="Модель для эмбеддингов")
-    MAX_TOKENS: int = Field(default=1000, description="Максимальное количество токенов")
-    TEMPERATURE: float = Field(default=0.7, description="Температура для генерации")
+    OPENAI_API_KEY: str  # API ключ OpenAI
+    OPENAI_MODEL: str = "gpt-4o-mini"  # Модель OpenAI для обработки
+    OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"  # Модель для эмбеддингов
+    MAX_TOKENS: int = 1000  # Максимальное количество токенов
+    TEMPERATURE: float = 0.7  # Температура для генерации
+
+    model_config = ConfigDict(frozen=True)
 
 
 class FAISSSettings(BaseModel):
     """Настройки для FAISS векторной базы данных"""
-    FAISS_SIMILARITY_THRESHOLD: float = Field(
-        default=0.85, 
-        description="Порог схожести для дедупликации новостей (0.0-1.0). "
-                   "Чем выше значение, тем строже фильтрация дублей. "
-                   "0.85 означает что статьи с схожестью >85% считаются дублями"
-    )
-    FAISS_INDEX_TYPE: str = Field(
-        default="IndexFlatIP", 
-        description="Тип FAISS индекса для поиска векторов. "
-                   "IndexFlatIP - точный поиск по скалярному произведению (рекомендуется). "
-                   "IndexFlatL2 - точный поиск по L2 расстоянию. "
-                   "IndexIVFFlat - приближенный поиск для больших объемов"
-    )
-    FAISS_NORMALIZE_VECTORS: bool = Field(
-        default=True,
-        description="Нормализовать векторы перед добавлением в FAISS индекс. "
-                   "True - рекомендуется для косинусного сходства. "
-                   "False - для использования сырых векторов"
-    )
-    MAX_NEWS_ITEMS_FOR_PROCESSING: int = Field(
-        default=100,
-        description="Максимальное количество новостей для обработки в одном batch. "
-                   "Ограничивает нагрузку на OpenAI API и память"
-    )
+    # Порог схожести для дедупликации новостей (0.0-1.0).
+    # Чем выше значение, тем строже фильтрация дублей.
+    # 0.85 означает что статьи с схожестью >85% считаются дублями
+    FAISS_SIMILARITY_THRESHOLD: float = 0.85
+    # Тип FAISS индекса для поиска векторов.
+    # IndexFlatIP - точный поиск по скалярному произведению (рекомендуется).
+    # IndexFlatL2 - точный поиск по L2 расстоянию.
+    # IndexIVFFlat - приближенный поиск для больших объемов
+    FAISS_INDEX_TYPE: str = "IndexFlatIP"
+    # Нормализовать векторы перед добавлением в FAISS индекс.
+    # True - рекомендуется для косинусного сходства.
+    # False - для использования сырых векторов
+    FAISS_NORMALIZE_VECTORS: bool = True
+    # Максимальное количество новостей для обработки в одном batch.
+    # Ограничивает нагрузку на OpenAI API и память
+    MAX_NEWS_ITEMS_FOR_PROCESSING: int = 100
+
+    model_config = ConfigDict(frozen=True)
 
 
 class PipelineSettings(BaseModel):
     """Настройки для pipeline обработки новостей"""
     # Убираем дефолтный язык - пусть будет None
-    DEFAULT_LIMIT: int = Field(
-        default=100,
-        description="Количество новостей по умолчанию для получения из API"
-    )
-    PIPELINE_TIMEOUT: int = Field(
-        default=300,
-        description="Максимальное время выполнения pipeline в секундах (5 минут)"
-    )
-    ENABLE_PARTIAL_RESULTS: bool = Field(
-        default=True,
-        description="Возвращать частичные результаты при ошибках в pipeline. "
-                   "True - продолжать выполнение даже при ошибках на отдельных этапах"
-    )
-    TASKS_LOGS_COUNT: int = Field(
-        default=10,
-        description="Максимальное количество задач в окне логов. "
-                   "Ограничивает количество аккордеонов с логами задач в веб-интерфейсе"
-    )
+    DEFAULT_LIMIT: int = 100  # Количество новостей по умолчанию для получения из API
+    PIPELINE_TIMEOUT: int = 300  # Максимальное время выполнения pipeline в секундах (5 минут)
+    # Возвращать частичные результаты при ошибках в pipeline.
+    # True - продолжать выполнение даже при ошибках на отдельных этапах
+    ENABLE_PARTIAL_RESULTS: bool = True
+    # Максимальное количество задач в окне логов.
+    # Ограничивает количество аккордеонов с логами задач в веб-интерфейсе
+    TASKS_LOGS_COUNT: int = 10
+
+    model_config = ConfigDict(frozen=True)
 
 
 class GoogleSettings(BaseModel):
     """Настройки для Google сервисов"""
-    GOOGLE_SHEET_ID: str = Field(..., description="ID Google Sheets документа")
-    GOOGLE_SERVICE_ACCOUNT_PATH: str = Field(..., description="Путь к файлу с Google service account JSON")
-    GOOGLE_ACCOUNT_EMAIL: str = Field(..., description="Email Google аккаунта")
-    GOOGLE_ACCOUNT_KEY: str = Field(..., description="Ключ Google аккаунта")
+    GOOGLE_SHEET_ID: str  # ID Google Sheets документа
+    GOOGLE_SERVICE_ACCOUNT_PATH: str  # Путь к файлу с Google service account JSON
+    GOOGLE_ACCOUNT_EMAIL: str  # Email Google аккаунта
+    GOOGLE_ACCOUNT_KEY: str  # Ключ Google аккаунта
+
+    model_config = ConfigDict(frozen=True)
 
 
 class Settings(BaseSettings):
     """Общие настройки приложения - только секретные переменные из .env"""
     
     # Секретные токены и ключи (только эти берутся из .env)
-    THENEWSAPI_API_TOKEN: Optional[str] = Field(default=None, description="API токен для TheNewsAPI")
-    NEWSAPI_API_KEY: Optional[str] = Field(default=None, description="API ключ для NewsAPI.org")
-    NEWSDATA_API_KEY: Optional[str] = Field(default=None, description="API ключ для NewsData.io")
-    MEDIASTACK_API_KEY: Optional[str] = Field(default=None, description="Access key для MediaStack API")
-    GNEWS_API_KEY: Optional[str] = Field(default=None, description="API ключ для GNews.io")
-    OPENAI_API_KEY: Optional[str] = Field(default=None, description="API ключ OpenAI")
-    GOOGLE_SHEET_ID: Optional[str] = Field(default=None, description="ID Google Sheets документа")
-    GOOGLE_SERVICE_ACCOUNT_PATH: Optional[str] = Field(default=None, description="Путь к файлу с Google service account JSON")
-    GOOGLE_ACCOUNT_EMAIL: Optional[str] = Field(default=None, description="Email Google аккаунта")
-    GOOGLE_ACCOUNT_KEY: Optional[str] = Field(default=None, description="Ключ Google аккаунта")
+    THENEWSAPI_API_TOKEN: Optional[str] = None  # API токен для TheNewsAPI
+    NEWSAPI_API_KEY: Optional[str] = None  # API ключ для NewsAPI.org
+    NEWSDATA_API_KEY: Optional[str] = None  # API ключ для NewsData.io
+    MEDIASTACK_API_KEY: Optional[str] = None  # Access key для MediaStack API
+    GNEWS_API_KEY: Optional[str] = None  # API ключ для GNews.io
+    OPENAI_API_KEY: Optional[str] = None  # API ключ OpenAI
+    GOOGLE_SHEET_ID: Optional[str] = None  # ID Google Sheets документа
+    GOOGLE_SERVICE_ACCOUNT_PATH: Optional[str] = None  # Путь к файлу с Google service account JSON
+    GOOGLE_ACCOUNT_EMAIL: Optional[str] = None  # Email Google аккаунта
+    GOOGLE_ACCOUNT_KEY: Optional[str] = None  # Ключ Google аккаунта
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -173,129 +188,224 @@ class Settings(BaseSettings):
     )
 
 
-@lru_cache()
-def get_settings() -> Settings:
-    """Получить все настройки приложения"""
-    return Settings()
+class LazySettings:
+    """
+    Прокси над Settings: чтение и разбор .env откладываются
+    до первого обращения к любому полю настроек.
+
+    Поля, repr и присваивание делегируются реальному Settings;
+    сам экземпляр Settings доступен через load().
+    """
+    __slots__ = ("_settings",)
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "_settings", None)
+
+    def load(self) -> Settings:
+        """Получить настоящий экземпляр Settings, прочитав .env при первом вызове"""
+        if self._settings is None:
+            with _SETTINGS_LOCK:
+                if self._settings is None:
+                    object.__setattr__(self, "_settings", Settings())
+        assert self._settings is not None
+        return self._settings
+
+    def __getattr__(self, name: str) -> Any:
+        # Служебные имена не делегируем: экземпляр без __init__ (copy, pickle)
+        # иначе уходит в бесконечную рекурсию через self._settings
+        if name == "_settings" or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "_settings":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.load(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(self.load())
+
+
+# Провайдеры новостей в порядке приоритета:
+# (имя провайдера, секретная переменная, класс настроек, поле для секрета)
+_PROVIDER_SPECS: tuple[tuple[str, str, type[ProviderSettings], str], ...] = (
+    ("thenewsapi_com", "THENEWSAPI_API_TOKEN", TheNewsAPISettings, "api_token"),
+    ("newsapi_org", "NEWSAPI_API_KEY", NewsAPISettings, "api_key"),
+    ("newsdata_io", "NEWSDATA_API_KEY", NewsDataIOSettings, "api_key"),
+    ("mediastack_com", "MEDIASTACK_API_KEY", MediaStackSettings, "access_key"),
+    ("gnews_io", "GNEWS_API_KEY", GNewsIOSettings, "api_key"),
+)
+_PROVIDER_ORDER = tuple(spec[0] for spec in _PROVIDER_SPECS)
+
+
+def _pick_default_provider(providers: Dict[str, Any]) -> str:
+    """Выбрать провайдера по умолчанию: первый доступный в порядке приоритета"""
+    return next((name for name in _PROVIDER_ORDER if name in providers), _PROVIDER_ORDER[0])
+
+
+# Кэшированные экземпляры настроек (ленивая инициализация при первом обращении)
+_SETTINGS: Optional[LazySettings] = None
+_NEWS_PROVIDERS_SETTINGS: Optional[NewsProvidersSettings] = None
+_AI_SETTINGS: Optional[AISettings] = None
+_GOOGLE_SETTINGS: Optional[GoogleSettings] = None
+_FAISS_SETTINGS: Optional[FAISSSettings] = None
+_PIPELINE_SETTINGS: Optional[PipelineSettings] = None
+
+# Настройки провайдеров старше TTL отдаются как есть и обновляются в фоне
+# (stale-while-revalidate), чтобы долгоживущие воркеры подхватывали ротацию ключей
+NEWS_PROVIDERS_SETTINGS_TTL = 300.0
+_NEWS_PROVIDERS_BUILT_AT = 0.0
+_NEWS_PROVIDERS_REFRESHING = False
+# Поколение кэша: увеличивается при сбросе, чтобы запоздавшее фоновое
+# обновление не записало настройки, собранные до reset_settings_cache()
+_NEWS_PROVIDERS_GENERATION = 0
+
+# RLock, так как геттеры вызывают get_settings() во время построения
+_SETTINGS_LOCK = threading.RLock()
+
+
+def reset_settings_cache() -> None:
+    """Сбросить кэш всех настроек (например, после изменения переменных окружения)"""
+    global _SETTINGS, _NEWS_PROVIDERS_SETTINGS, _NEWS_PROVIDERS_BUILT_AT, _AI_SETTINGS
+    global _NEWS_PROVIDERS_REFRESHING, _NEWS_PROVIDERS_GENERATION
+    global _GOOGLE_SETTINGS, _FAISS_SETTINGS, _PIPELINE_SETTINGS
+    with _SETTINGS_LOCK:
+        _SETTINGS = None
+        _NEWS_PROVIDERS_SETTINGS = None
+        _NEWS_PROVIDERS_BUILT_AT = 0.0
+        _NEWS_PROVIDERS_REFRESHING = False
+        _NEWS_PROVIDERS_GENERATION += 1
+        _AI_SETTINGS = None
+        _GOOGLE_SETTINGS = None
+        _FAISS_SETTINGS = None
+        _PIPELINE_SETTINGS = None
+
+
+def get_settings() -> LazySettings:
+    """
+    Получить все настройки приложения.
+
+    Возвращает прокси LazySettings: поля читаются как у Settings,
+    а .env разбирается при первом обращении. Экземпляр Settings - через load().
+    """
+    global _SETTINGS
+    if _SETTINGS is None:
+        with _SETTINGS_LOCK:
+            if _SETTINGS is None:
+                # .env будет прочитан только при первом обращении к полю
+                _SETTINGS = LazySettings()
+    return _SETTINGS
 
 
-@lru_cache()
 def get_news_providers_settings() -> NewsProvidersSettings:
-    """Получить настройки всех новостных провайдеров"""
+    """
+    Получить настройки всех новостных провайдеров.
+
+    Если настройки старше NEWS_PROVIDERS_SETTINGS_TTL, возвращаются текущие,
+    а пересборка запускается в фоновом потоке.
+    """
+    global _NEWS_PROVIDERS_SETTINGS, _NEWS_PROVIDERS_BUILT_AT
+    if _NEWS_PROVIDERS_SETTINGS is None:
+        with _SETTINGS_LOCK:
+            if _NEWS_PROVIDERS_SETTINGS is None:
+                _NEWS_PROVIDERS_SETTINGS = _build_news_providers_settings()
+                _NEWS_PROVIDERS_BUILT_AT = time.monotonic()
+    elif time.monotonic() - _NEWS_PROVIDERS_BUILT_AT > NEWS_PROVIDERS_SETTINGS_TTL:
+        _schedule_news_providers_refresh()
+    return _NEWS_PROVIDERS_SETTINGS
+
+
+def _schedule_news_providers_refresh() -> None:
+    """Запустить фоновое обновление настроек провайдеров, если оно еще не запущено"""
+    global _NEWS_PROVIDERS_REFRESHING
+    with _SETTINGS_LOCK:
+        if _NEWS_PROVIDERS_REFRESHING:
+            return
+        _NEWS_PROVIDERS_REFRESHING = True
+        generation = _NEWS_PROVIDERS_GENERATION
+    threading.Thread(
+        target=_refresh_news_providers_settings,
+        args=(generation,),
+        name="news-providers-settings-refresh",
+        daemon=True
+    ).start()
+
+
+def _refresh_news_providers_settings(generation: Optional[int] = None) -> None:
+    """
+    Перечитать .env и окружение; при ошибке оставить прежние настройки.
+
+    Args:
+        generation: Поколение кэша на момент запуска обновления
+            (по умолчанию - текущее)
+    """
+    global _NEWS_PROVIDERS_SETTINGS, _NEWS_PROVIDERS_BUILT_AT, _NEWS_PROVIDERS_REFRESHING
+    if generation is None:
+        generation = _NEWS_PROVIDERS_GENERATION
+    try:
+        refreshed: Optional[NewsProvidersSettings] = _build_news_providers_settings(Settings())
+    except Exception:
+        refreshed = None
+    with _SETTINGS_LOCK:
+        if generation != _NEWS_PROVIDERS_GENERATION:
+            # Кэш сброшен во время обновления: результат устарел, флаг уже сброшен
+            return
+        if refreshed is not None:
+            _NEWS_PROVIDERS_SETTINGS = refreshed
+        # Следующая попытка - не раньше чем через TTL, даже если эта не удалась
+        _NEWS_PROVIDERS_BUILT_AT = time.monotonic()
+        _NEWS_PROVIDERS_REFRESHING = False
+
+
+def _build_providers(resolve: Callable[[str], Optional[str]]) -> Dict[str, ProviderSettings]:
+    """
+    Построить настройки провайдеров, для которых задан секретный ключ.
+
+    Args:
+        resolve: Функция получения значения секретной переменной по имени
+
+    Returns:
+        Словарь настроек провайдеров в порядке приоритета
+    """
+    providers: Dict[str, ProviderSettings] = {}
+    for priority, (name, env_key, settings_class, key_field) in enumerate(_PROVIDER_SPECS, start=1):
+        value = resolve(env_key)
+        if value:
+            providers[name] = settings_class(**{key_field: value}, priority=priority, enabled=True)
+    return providers
+
+
+def _build_news_providers_settings(settings: Optional[Union[Settings, LazySettings]] = None) -> NewsProvidersSettings:
+    """Построить настройки всех новостных провайдеров"""
     try:
         # Получаем секретные данные из Settings
-        settings = get_settings()
-        
-        # Создаем настройки провайдеров
-        providers: Dict[str, Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]] = {}
-        
-        # TheNewsAPI провайдер
-        if settings.THENEWSAPI_API_TOKEN:
-            providers["thenewsapi_com"] = TheNewsAPISettings(
-                api_token=settings.THENEWSAPI_API_TOKEN,
-                priority=1,
-                enabled=True
-            )
-        
-        # NewsAPI провайдер
-        if settings.NEWSAPI_API_KEY:
-            providers["newsapi_org"] = NewsAPISettings(
-                api_key=settings.NEWSAPI_API_KEY,
-                priority=2,
-                enabled=True
-            )
-        
-        # NewsData.io провайдер
-        if settings.NEWSDATA_API_KEY:
-            providers["newsdata_io"] = NewsDataIOSettings(
-                api_key=settings.NEWSDATA_API_KEY,
-                priority=3,
-                enabled=True
-            )
-        
-        # MediaStack провайдер
-        if settings.MEDIASTACK_API_KEY:
-            providers["mediastack_com"] = MediaStackSettings(
-                access_key=settings.MEDIASTACK_API_KEY,
-                priority=4,
-                enabled=True
-            )
-        
-        # GNews провайдер
-        if settings.GNEWS_API_KEY:
-            providers["gnews_io"] = GNewsIOSettings(
-                api_key=settings.GNEWS_API_KEY,
-                priority=5,
-                enabled=True
-            )
-        
-        return NewsProvidersSettings(
-            providers=providers,
-            default_provider="thenewsapi_com" if "thenewsapi_com" in providers else (
-                "newsapi_org" if "newsapi_org" in providers else (
-                    "newsdata_io" if "newsdata_io" in providers else (
-                        "mediastack_com" if "mediastack_com" in providers else (
-                            "gnews_io" if "gnews_io" in providers else "thenewsapi_com"
-                        )
-                    )
-                )
-            ),
-            fallback_providers=list(providers.keys())
-        )
-    except Exception as e:
+        if settings is None:
+            settings = get_settings()
+        providers = _build_providers(lambda env_key: getattr(settings, env_key, None))
+    except Exception:
         # Fallback конфигурация с переменными окружения
-        fallback_providers: Dict[str, Union[TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings, MediaStackSettings, GNewsIOSettings]] = {}
-        
-        thenewsapi_token = os.getenv("THENEWSAPI_API_TOKEN")
-        if thenewsapi_token:
-            fallback_providers["thenewsapi_com"] = TheNewsAPISettings(
-                api_token=thenewsapi_token,
-                priority=1,
-                enabled=True
-            )
-        
-        newsapi_key = os.getenv("NEWSAPI_API_KEY")
-        if newsapi_key:
-            fallback_providers["newsapi_org"] = NewsAPISettings(
-                api_key=newsapi_key,
-                priority=2,
-                enabled=True
-            )
-        
-        newsdata_key = os.getenv("NEWSDATA_API_KEY")
-        if newsdata_key:
-            fallback_providers["newsdata_io"] = NewsDataIOSettings(
-                api_key=newsdata_key,
-                priority=3,
-                enabled=True
-            )
-        
-        mediastack_key = os.getenv("MEDIASTACK_API_KEY")
-        if mediastack_key:
-            fallback_providers["mediastack_com"] = MediaStackSettings(
-                access_key=mediastack_key,
-                priority=4,
-                enabled=True
-            )
-        
-        gnews_key = os.getenv("GNEWS_API_KEY")
-        if gnews_key:
-            fallback_providers["gnews_io"] = GNewsIOSettings(
-                api_key=gnews_key,
-                priority=5,
-                enabled=True
-            )
-        
-        return NewsProvidersSettings(
-            providers=fallback_providers,
-            default_provider="thenewsapi_com" if "thenewsapi_com" in fallback_providers else "newsapi_org",
-            fallback_providers=list(fallback_providers.keys())
-        )
+        providers = _build_providers(os.environ.get)
+
+    return NewsProvidersSettings(
+        providers=providers,
+        default_provider=_pick_default_provider(providers),
+        fallback_providers=list(providers.keys())
+    )
 
 
-@lru_cache()
 def get_ai_settings() -> AISettings:
     """Получить настройки для AI модулей"""
+    global _AI_SETTINGS
+    if _AI_SETTINGS is None:
+        with _SETTINGS_LOCK:
+            if _AI_SETTINGS is None:
+                _AI_SETTINGS = _build_ai_settings()
+    return _AI_SETTINGS
+
+
+def _build_ai_settings() -> AISettings:
+    """Построить настройки для AI модулей"""
     try:
         # Получаем секретные данные из Settings, остальное берем из дефолтов класса
         settings = get_settings()
@@ -307,7 +417,7 @@ def get_ai_settings() -> AISettings:
         )
     except Exception:
         # Если не удается получить общие настройки, пытаемся получить только нужные
-        openai_key = os.getenv("OPENAI_API_KEY")
+        openai_key = os.environ.get("OPENAI_API_KEY")
         if not openai_key:
             raise ValueError("OPENAI_API_KEY is required")
         return AISettings(
@@ -315,9 +425,18 @@ def get_ai_settings() -> AISettings:
         )
 
 
-@lru_cache()
 def get_google_settings() -> GoogleSettings:
     """Получить настройки для Google сервисов"""
+    global _GOOGLE_SETTINGS
+    if _GOOGLE_SETTINGS is None:
+        with _SETTINGS_LOCK:
+            if _GOOGLE_SETTINGS is None:
+                _GOOGLE_SETTINGS = _build_google_settings()
+    return _GOOGLE_SETTINGS
+
+
+def _build_google_settings() -> GoogleSettings:
+    """Построить настройки для Google сервисов"""
     try:
         # Получаем секретные данные из Settings
         settings = get_settings()
@@ -339,11 +458,12 @@ def get_google_settings() -> GoogleSettings:
         )
     except Exception:
         # Если не удается получить общие настройки, пытаемся получить только нужные
+        env = os.environ
         google_settings = [
-            os.getenv("GOOGLE_SHEET_ID"),
-            os.getenv("GOOGLE_SERVICE_ACCOUNT_PATH"),
-            os.getenv("GOOGLE_ACCOUNT_EMAIL"),
-            os.getenv("GOOGLE_ACCOUNT_KEY")
+            env.get("GOOGLE_SHEET_ID"),
+            env.get("GOOGLE_SERVICE_ACCOUNT_PATH"),
+            env.get("GOOGLE_ACCOUNT_EMAIL"),
+            env.get("GOOGLE_ACCOUNT_KEY")
         ]
         if not all(google_settings):
             raise ValueError("All Google settings are required")
@@ -359,18 +479,22 @@ def get_google_settings() -> GoogleSettings:
         )
 
 
-@lru_cache()
 def get_faiss_settings() -> FAISSSettings:
     """Получить настройки для FAISS векторной базы данных"""
-    # Все настройки используют дефолтные значения из класса FAISSSettings
-    return FAISSSettings()
+    global _FAISS_SETTINGS
+    if _FAISS_SETTINGS is None:
+        # Все настройки используют дефолтные значения из класса FAISSSettings
+        _FAISS_SETTINGS = FAISSSettings()
+    return _FAISS_SETTINGS
 
 
-@lru_cache()
 def get_pipeline_settings() -> PipelineSettings:
     """Получить настройки для pipeline обработки новостей"""
-    # Все настройки используют дефолтные значения из класса PipelineSettings
-    return PipelineSettings()
+    global _PIPELINE_SETTINGS
+    if _PIPELINE_SETTINGS is None:
+        # Все настройки используют дефолтные значения из класса PipelineSettings
+        _PIPELINE_SETTINGS = PipelineSettings()
+    return _PIPELINE_SETTINGS
 
 
 def get_log_level() -> str:
@@ -2,10 +2,26 @@
 
 import sys
 import argparse
+import importlib.util
 from typing import Optional
 from src.logger import setup_logger
 from src.config import get_news_providers_settings, get_ai_settings, get_google_settings
 
+logger = setup_logger(__name__)
+
+# Модули, без которых сервис не может работать
+_REQUIRED_MODULES: tuple[str, ...] = (
+    'openai',
+    'langchain',
+    'faiss',
+    'gspread',
+    'google.auth',
+    'pydantic',
+    'requests',
+    'structlog',
+    'tenacity',
+)
+
 
 def check_configuration() -> bool:
     """
@@ -14,8 +30,6 @@ def check_configuration() -> bool:
     Returns:
         True если конфигурация корректна, False иначе
     """
-    logger = setup_logger(__name__)
-    
     try:
         # Проверяем настройки новостных провайдеров
         try:
@@ -62,6 +76,19 @@ def check_configuration() -> bool:
         return False
 
 
+def _is_module_available(module: str) -> bool:
+    """Проверить наличие модуля без выполнения его инициализации"""
+    # Уже загруженные модули (pydantic, structlog и т.п.) не требуют поиска на диске.
+    # Запись None в sys.modules означает заблокированный импорт - проверяем через find_spec
+    if sys.modules.get(module) is not None:
+        return True
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ImportError:
+        # Для вложенных модулей (google.auth) отсутствует родительский пакет
+        return False
+
+
 def check_dependencies() -> bool:
     """
     Проверка доступности необходимых зависимостей.
@@ -69,25 +96,7 @@ def check_dependencies() -> bool:
     Returns:
         True если все зависимости доступны, False иначе
     """
-    logger = setup_logger(__name__)
-    required_modules = [
-        'openai',
-        'langchain',
-        'faiss',
-        'gspread',
-        'google.auth',
-        'pydantic',
-        'requests',
-        'structlog',
-        'tenacity'
-    ]
-    
-    missing_modules = []
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    missing_modules = [module for module in _REQUIRED_MODULES if not _is_module_available(module)]
     
     if missing_modules:
         logger.error(f"Отсутствуют обязательные модули: {missing_modules}")
@@ -104,7 +113,6 @@ def dry_run_check() -> bool:
     Returns:
         True если dry-run возможен, False иначе
     """
-    logger = setup_logger(__name__)
     try:
         # Проверяем, что можем импортировать основные модули
         from src.services.news.news_processor import create_news_processor
@@ -136,7 +144,6 @@ def healthcheck(dry_run: bool = False) -> bool:
     Returns:
         True если все проверки пройдены, False иначе
     """
-    logger = setup_logger(__name__)
     logger.info("🔍 Запуск проверки здоровья сервиса...")
     
     checks = [
@@ -1,14 +1,17 @@
 # src/langchain/__init__.py
 
-from .news_chain import (
-    NewsItem, 
-    NewsProcessingChain, 
-    create_news_processing_chain,
-    LLMProcessingError,
-    EmbeddingError,
-    RankingError,
-    RateLimitError
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .news_chain import (
+        NewsItem, 
+        NewsProcessingChain, 
+        create_news_processing_chain,
+        LLMProcessingError,
+        EmbeddingError,
+        RankingError,
+        RateLimitError
+    )
 
 __all__ = [
     "NewsItem",
@@ -18,4 +21,14 @@ __all__ = [
     "EmbeddingError", 
     "RankingError",
     "RateLimitError"
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый импорт news_chain (PEP 562) - тяжелые зависимости грузятся при первом обращении"""
+    if name in __all__:
+        from . import news_chain
+        value = getattr(news_chain, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,119 @@
+# /src/langchain/embedding_cache.py
+# Кэш embeddings: LRU в памяти + опциональное хранилище SQLite на диске
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# Тип элементов векторов в хранилище на диске
+DISK_DTYPE = np.float16
+
+
+class EmbeddingCache:
+    """
+    Двухуровневый кэш embeddings.
+
+    Ключ - SHA-256 от имени модели и текста, поэтому один и тот же текст
+    для разных моделей кэшируется раздельно. Первый уровень - LRU в памяти,
+    второй (если указан path) - таблица SQLite с TTL, переживающая перезапуски.
+    На диске векторы хранятся в float16: для косинусной дедупликации точности
+    достаточно, а размер записи вдвое меньше.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_memory_items: int = 10_000,
+                 ttl: float = 7 * 24 * 3600):
+        """
+        Args:
+            path: Путь к файлу SQLite (если None, кэш только в памяти)
+            max_memory_items: Максимальное количество векторов в памяти
+            ttl: Время жизни записи на диске (секунды)
+        """
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Ключ кэша для пары (модель, текст)"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        """Получить embedding из кэша или None при промахе"""
+        key = self.make_key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector
+
+            if self._connection is None:
+                return None
+
+            row = self._connection.execute(
+                "SELECT vector FROM embeddings WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+
+            vector = np.frombuffer(row[0], dtype=DISK_DTYPE).astype(np.float32)
+            self._remember(key, vector)
+            return vector
+
+    def set(self, model: str, text: str, vector: np.ndarray) -> None:
+        """Сохранить embedding в кэш"""
+        self.set_many(model, [text], [vector])
+
+    def set_many(self, model: str, texts: List[str], vectors: List[np.ndarray]) -> None:
+        """Сохранить пачку embeddings в кэш одной транзакцией"""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(model, text)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.astype(DISK_DTYPE).tobytes(), time.time()))
+            if self._connection is not None and rows:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._connection.commit()
+
+    def clear(self) -> None:
+        """Очистить оба уровня кэша"""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM embeddings")
+                self._connection.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Положить вектор в LRU, вытеснив самый старый при переполнении"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -1,23 +1,58 @@
 # /src/langchain/news_chain.py
 # News LLM chain 
 
+import asyncio
+import hashlib
+import importlib
 import json
+import re
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
-from langchain.schema import Document
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.schema.runnable import RunnablePassthrough
-from langchain.schema.output_parser import StrOutputParser
-import faiss
-
-from src.openai_client import OpenAIClient
+
+from src.openai_client import OpenAIClient, create_openai_client
+from src.langchain.embedding_cache import EmbeddingCache
 from src.config import get_ai_settings
 from src.logger import setup_logger
 
+if TYPE_CHECKING:
+    import faiss
+    from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+    from langchain.prompts import PromptTemplate
+    from langchain.schema.runnable import RunnablePassthrough
+    from langchain.schema.output_parser import StrOutputParser
+
+
+# Тяжелые зависимости (faiss, langchain) загружаются при создании первой цепочки,
+# поэтому импорт модуля ради NewsItem остается быстрым. Имя -> (модуль, атрибут)
+_LAZY_IMPORTS = {
+    "faiss": ("faiss", None),
+    "OpenAIEmbeddings": ("langchain_openai", "OpenAIEmbeddings"),
+    "ChatOpenAI": ("langchain_openai", "ChatOpenAI"),
+    "PromptTemplate": ("langchain.prompts", "PromptTemplate"),
+    "RunnablePassthrough": ("langchain.schema.runnable", "RunnablePassthrough"),
+    "StrOutputParser": ("langchain.schema.output_parser", "StrOutputParser"),
+}
+
+
+def _load_lazy_imports() -> None:
+    """Импортирует тяжелые зависимости в глобальное пространство модуля (уже заданные имена не трогает)"""
+    module_globals = globals()
+    for name, (module_name, attribute) in _LAZY_IMPORTS.items():
+        if name not in module_globals:
+            value = importlib.import_module(module_name)
+            module_globals[name] = getattr(value, attribute) if attribute else value
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый доступ к тяжелым зависимостям как к атрибутам модуля (PEP 562)"""
+    if name in _LAZY_IMPORTS:
+        _load_lazy_imports()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class LLMProcessingError(Exception):
     """Базовое исключение для ошибок обработки LLM"""
@@ -39,8 +74,58 @@ class RateLimitError(LLMProcessingError):
     pass
 
 
+# Начиная с этого размера выборки дедупликация использует приближенный индекс IVF
+ANN_INDEX_MIN_ITEMS = 2000
+# Количество проверяемых кластеров IVF при поиске
+ANN_INDEX_NPROBE = 16
+# Количество соседей, запрашиваемых у приближенного индекса для каждой новости
+ANN_SEARCH_NEIGHBORS = 20
+
+
+# Количество новостей в одном запросе асинхронного ранжирования
+RANKING_GROUP_SIZE = 10
+# Максимальное количество одновременных запросов ранжирования к LLM
+RANKING_MAX_CONCURRENCY = 5
+# Максимальное количество результатов ранжирования в кэше цепочки
+RANKING_CACHE_SIZE = 256
+# JSON объект внутри произвольного текста ответа LLM
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+# Критерии ранжирования по умолчанию
+DEFAULT_RANKING_CRITERIA = """
+            1. Глобальная важность и влияние на мировую экономику
+            2. Актуальность и новизна информации
+            3. Достоверность источника
+            4. Потенциальное влияние на технологические рынки
+            5. Социальная значимость
+            """
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Нормализует строки матрицы по L2 на месте (нулевые строки остаются нулевыми)
+
+    Args:
+        matrix: Матрица float32 размера (N, d)
+
+    Returns:
+        Та же матрица с единичными строками
+    """
+    norms = np.einsum("ij,ij->i", matrix, matrix)
+    np.sqrt(norms, out=norms)
+    np.divide(1.0, norms, out=norms, where=norms > 0)
+    matrix *= norms[:, None]
+    return matrix
+
+
 class NewsItem:
     """Структура для новостной статьи"""
+
+    # Фиксированный набор полей без __dict__: меньше памяти на экземпляр при больших батчах
+    __slots__ = (
+        "title", "description", "url", "published_at", "source", "category", "language",
+        "image_url", "uuid", "keywords", "snippet",
+        "embedding", "similarity_score", "relevance_score", "is_duplicate", "duplicate_of"
+    )
     
     def __init__(self, 
                  title: str, 
@@ -116,33 +201,39 @@ class NewsProcessingChain:
                  similarity_threshold: float = 0.85,
                  max_news_items: int = 50,
                  max_retries: int = 3,
-                 retry_delay: float = 1.0):
+                 retry_delay: float = 1.0,
+                 embedding_cache: Optional[EmbeddingCache] = None):
         """
         Инициализация цепочки обработки новостей
         
         Args:
-            openai_client: Клиент OpenAI (если None, создается новый)
+            openai_client: Клиент OpenAI (если None, используется общий из create_openai_client)
             embedding_model: Модель для создания embeddings
             llm_model: Модель для LLM операций
             similarity_threshold: Порог схожести для дедупликации
             max_news_items: Максимальное количество новостей для обработки
             max_retries: Максимальное количество повторных попыток при ошибках
             retry_delay: Задержка между повторными попытками (секунды)
+            embedding_cache: Кэш embeddings (если None, создается кэш в памяти)
         """
-        self.openai_client = openai_client or OpenAIClient()
+        self.openai_client = openai_client or create_openai_client()
         self.embedding_model = embedding_model
         self.llm_model = llm_model
         self.similarity_threshold = similarity_threshold
         self.max_news_items = max_news_items
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.embedding_cache = embedding_cache if embedding_cache is not None else EmbeddingCache()
+        # Кэш результатов ранжирования: ключ набора новостей и критериев -> оценки по URL
+        self._ranking_cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
         self._logger = None
         
         # Инициализируем LangChain компоненты
+        _load_lazy_imports()
         self._setup_langchain_components()
         
         # FAISS индекс для поиска дублей
-        self.faiss_index: Optional[faiss.IndexFlatIP] = None
+        self.faiss_index: Optional["faiss.IndexFlatIP"] = None
         self.indexed_news: List[NewsItem] = []
     
     @property
@@ -169,11 +260,13 @@ class NewsProcessingChain:
     
     def _create_ranking_chain(self, api_key: str):
         """Создание цепочки для ранжирования новостей"""
-        # LLM для ранжирования
+        # LLM для ранжирования. JSON mode гарантирует синтаксически корректный
+        # JSON объект в ответе, поэтому ошибки разбора не тратят повторный вызов LLM
         llm = ChatOpenAI(
             model=self.llm_model,
             temperature=0.1,
-            openai_api_key=api_key
+            openai_api_key=api_key,
+            model_kwargs={"response_format": {"type": "json_object"}}
         )
         
         # Промпт для ранжирования новостей
@@ -212,6 +305,50 @@ class NewsProcessingChain:
             | StrOutputParser()
         )
     
+    def _get_retry_delay(self, error: Exception, attempt: int, retries: int) -> float:
+        """
+        Определяет задержку перед следующей попыткой по типу ошибки
+
+        Args:
+            error: Исключение, возникшее при попытке
+            attempt: Номер текущей попытки (с нуля)
+            retries: Максимальное количество повторов
+
+        Returns:
+            Задержка перед повтором (секунды)
+
+        Raises:
+            RateLimitError: Если лимит запросов превышен на последней попытке
+            LLMProcessingError: Если повторять попытку не нужно или попытки исчерпаны
+        """
+        error_message = str(error).lower()
+
+        if "rate limit" in error_message or "429" in error_message:
+            if attempt < retries:
+                delay = self.retry_delay * (2 ** attempt)  # Экспоненциальная задержка
+                self.logger.warning(f"Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{retries + 1})")
+                return delay
+            raise RateLimitError(f"Rate limit exceeded after {retries + 1} attempts: {str(error)}")
+
+        elif "timeout" in error_message or "connection" in error_message:
+            if attempt < retries:
+                delay = self.retry_delay * (attempt + 1)  # Линейная задержка для сетевых ошибок
+                self.logger.warning(f"Network error, retrying in {delay}s (attempt {attempt + 1}/{retries + 1}): {str(error)}")
+                return delay
+            raise LLMProcessingError(f"Network error after {retries + 1} attempts: {str(error)}")
+
+        elif "authentication" in error_message or "unauthorized" in error_message:
+            # Не повторяем попытки при ошибках аутентификации
+            raise LLMProcessingError(f"Authentication error: {str(error)}")
+
+        else:
+            # Для других ошибок делаем ограниченные повторы
+            if attempt < min(2, retries):  # Максимум 2 попытки для неизвестных ошибок
+                delay = self.retry_delay
+                self.logger.warning(f"Unknown error, retrying in {delay}s (attempt {attempt + 1}/{retries + 1}): {str(error)}")
+                return delay
+            raise LLMProcessingError(f"Unknown error after {attempt + 1} attempts: {str(error)}")
+
     def _retry_with_backoff(self, func, *args, max_retries: int = None, **kwargs):
         """
         Выполняет функцию с повторными попытками и экспоненциальной задержкой
@@ -236,45 +373,98 @@ class NewsProcessingChain:
                 return func(*args, **kwargs)
             except Exception as e:
                 last_exception = e
-                
-                # Проверяем тип ошибки
-                error_message = str(e).lower()
-                
-                if "rate limit" in error_message or "429" in error_message:
-                    if attempt < retries:
-                        delay = self.retry_delay * (2 ** attempt)  # Экспоненциальная задержка
-                        self.logger.warning(f"Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{retries + 1})")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise RateLimitError(f"Rate limit exceeded after {retries + 1} attempts: {str(e)}")
-                
-                elif "timeout" in error_message or "connection" in error_message:
-                    if attempt < retries:
-                        delay = self.retry_delay * (attempt + 1)  # Линейная задержка для сетевых ошибок
-                        self.logger.warning(f"Network error, retrying in {delay}s (attempt {attempt + 1}/{retries + 1}): {str(e)}")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise LLMProcessingError(f"Network error after {retries + 1} attempts: {str(e)}")
-                
-                elif "authentication" in error_message or "unauthorized" in error_message:
-                    # Не повторяем попытки при ошибках аутентификации
-                    raise LLMProcessingError(f"Authentication error: {str(e)}")
-                
-                else:
-                    # Для других ошибок делаем ограниченные повторы
-                    if attempt < min(2, retries):  # Максимум 2 попытки для неизвестных ошибок
-                        delay = self.retry_delay
-                        self.logger.warning(f"Unknown error, retrying in {delay}s (attempt {attempt + 1}/{retries + 1}): {str(e)}")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        raise LLMProcessingError(f"Unknown error after {attempt + 1} attempts: {str(e)}")
+                time.sleep(self._get_retry_delay(e, attempt, retries))
         
         # Если дошли сюда, значит все попытки исчерпаны
         raise LLMProcessingError(f"All retry attempts failed. Last error: {str(last_exception)}")
 
+    async def _aretry_with_backoff(self, func, *args, max_retries: int = None, **kwargs):
+        """
+        Асинхронный вариант _retry_with_backoff для корутинных функций
+
+        Args:
+            func: Асинхронная функция для выполнения
+            *args: Позиционные аргументы функции
+            max_retries: Максимальное количество попыток (если None, использует self.max_retries)
+            **kwargs: Именованные аргументы функции
+
+        Returns:
+            Результат выполнения функции
+
+        Raises:
+            LLMProcessingError: Если все попытки исчерпаны
+        """
+        retries = max_retries or self.max_retries
+        last_exception = None
+
+        for attempt in range(retries + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                last_exception = e
+                await asyncio.sleep(self._get_retry_delay(e, attempt, retries))
+
+        raise LLMProcessingError(f"All retry attempts failed. Last error: {str(last_exception)}")
+
+    def _lookup_cached_embeddings(self, texts: List[str]) -> Tuple[List[Optional[np.ndarray]], List[str]]:
+        """
+        Ищет embeddings в кэше
+
+        Args:
+            texts: Тексты для embedding
+
+        Returns:
+            Кортеж (найденные векторы или None для каждого текста,
+            уникальные тексты-промахи в порядке первого появления)
+        """
+        cached = [self.embedding_cache.get(self.embedding_model, text) for text in texts]
+        # Одинаковые тексты (одна история из разных источников) отправляем в API один раз
+        miss_texts = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        return cached, miss_texts
+
+    def _assign_embeddings(self,
+                           news_items: List[NewsItem],
+                           texts: List[str],
+                           cached: List[Optional[np.ndarray]],
+                           miss_texts: List[str],
+                           new_embeddings: List[List[float]]) -> None:
+        """
+        Сохраняет новые embeddings в кэш и присваивает все embeddings новостям в исходном порядке
+
+        Все embeddings батча хранятся в одной непрерывной матрице float32,
+        embedding каждой новости - представление (view) ее строки.
+
+        Args:
+            news_items: Список новостей
+            texts: Тексты для embedding каждой новости
+            cached: Векторы из кэша (None для промахов)
+            miss_texts: Уникальные тексты, отправленные в API
+            new_embeddings: Embeddings, полученные из API для miss_texts
+        """
+        if miss_texts:
+            self.embedding_cache.set_many(self.embedding_model, miss_texts, new_embeddings)
+
+        # Ответ API переводим в матрицу одним вызовом, остальные строки вставляем по индексам
+        new_matrix = np.asarray(new_embeddings, dtype=np.float32)
+        hit_rows = [row for row, vector in enumerate(cached) if vector is not None]
+        if not hit_rows and len(miss_texts) == len(texts):
+            matrix = np.ascontiguousarray(new_matrix)
+        else:
+            dimension = new_matrix.shape[1] if miss_texts else len(cached[hit_rows[0]])
+            matrix = np.empty((len(texts), dimension), dtype=np.float32)
+            if hit_rows:
+                matrix[hit_rows] = np.stack([cached[row] for row in hit_rows])
+            if miss_texts:
+                miss_positions = {text: position for position, text in enumerate(miss_texts)}
+                miss_rows = [row for row, vector in enumerate(cached) if vector is None]
+                matrix[miss_rows] = new_matrix[[miss_positions[texts[row]] for row in miss_rows]]
+
+        for item, row in zip(news_items, matrix):
+            item.embedding = row
+
+        if len(miss_texts) < len(news_items):
+            self.logger.info(f"Requested embeddings for {len(miss_texts)} unique uncached texts of {len(news_items)} items")
+
     def create_embeddings(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """
         Создает embeddings для новостей с обработкой ошибок и повторными попытками
@@ -293,20 +483,54 @@ class NewsProcessingChain:
         if not news_items:
             return news_items
         
-        # Получаем тексты для embedding
+        # Получаем тексты для embedding, известные embeddings берем из кэша
         texts = [item.get_content_for_embedding() for item in news_items]
+        cached, miss_texts = self._lookup_cached_embeddings(texts)
         
         def _create_embeddings_batch():
             """Внутренняя функция для создания embeddings"""
-            return self.embeddings.embed_documents(texts)
+            return self.embeddings.embed_documents(miss_texts)
         
         try:
-            # Создаем embeddings через LangChain с повторными попытками
-            embeddings = self._retry_with_backoff(_create_embeddings_batch)
+            # Создаем embeddings через LangChain с повторными попытками (только для промахов кэша)
+            new_embeddings = self._retry_with_backoff(_create_embeddings_batch) if miss_texts else []
+            self._assign_embeddings(news_items, texts, cached, miss_texts, new_embeddings)
             
-            # Присваиваем embeddings новостям
-            for item, embedding in zip(news_items, embeddings):
-                item.embedding = np.array(embedding, dtype=np.float32)
+            self.logger.info(f"Successfully created embeddings for {len(news_items)} items")
+            return news_items
+
+        except Exception as e:
+            error_msg = f"Failed to create embeddings after all retry attempts: {str(e)}"
+            self.logger.error(error_msg)
+            raise EmbeddingError(error_msg) from e
+
+    async def acreate_embeddings(self, news_items: List[NewsItem]) -> List[NewsItem]:
+        """
+        Асинхронный вариант create_embeddings: запрос к API не блокирует event loop
+
+        Args:
+            news_items: Список новостей
+
+        Returns:
+            Список новостей с embeddings
+
+        Raises:
+            EmbeddingError: При критических ошибках создания embeddings
+        """
+        self.logger.info(f"Creating embeddings for {len(news_items)} news items (async)")
+
+        if not news_items:
+            return news_items
+
+        texts = [item.get_content_for_embedding() for item in news_items]
+        cached, miss_texts = self._lookup_cached_embeddings(texts)
+
+        try:
+            new_embeddings = (
+                await self._aretry_with_backoff(self.embeddings.aembed_documents, miss_texts)
+                if miss_texts else []
+            )
+            self._assign_embeddings(news_items, texts, cached, miss_texts, new_embeddings)
             
             self.logger.info(f"Successfully created embeddings for {len(news_items)} items")
             return news_items
@@ -315,7 +539,37 @@ class NewsProcessingChain:
             error_msg = f"Failed to create embeddings after all retry attempts: {str(e)}"
             self.logger.error(error_msg)
             raise EmbeddingError(error_msg) from e
-    
+
+    def _search_similar_embeddings(self, embeddings_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ищет ближайших соседей каждой новости по косинусному сходству
+
+        Небольшие выборки считаются точно одним матричным произведением M @ M.T
+        без построения индекса. Для больших выборок используется приближенный
+        FAISS IndexIVFFlat, обученный на самой выборке, и ограниченное число
+        соседей: точный поиск растет как O(N²·d).
+
+        Args:
+            embeddings_matrix: Нормализованная матрица embeddings (N, d)
+
+        Returns:
+            Кортеж (сходства, индексы соседей) - матрицы (N, k), в каждой строке
+            соседи упорядочены по убыванию сходства, -1 означает отсутствие соседа
+        """
+        count, dimension = embeddings_matrix.shape
+
+        if count < ANN_INDEX_MIN_ITEMS:
+            similarity_matrix = embeddings_matrix @ embeddings_matrix.T
+            indices = np.argsort(-similarity_matrix, axis=1, kind="stable")
+            return np.take_along_axis(similarity_matrix, indices, axis=1), indices
+
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, int(np.sqrt(count)), faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings_matrix)
+        index.add(embeddings_matrix)
+        index.nprobe = ANN_INDEX_NPROBE
+        return index.search(embeddings_matrix, min(count, ANN_SEARCH_NEIGHBORS))
+
     def deduplicate_news(self, news_items: List[NewsItem]) -> List[NewsItem]:
         """
         Дедупликация новостей на основе семантического сходства
@@ -339,42 +593,46 @@ class NewsProcessingChain:
         if not items_with_embeddings:
             return news_items
         
-        # Создаем FAISS индекс для быстрого поиска
+        # Собираем embeddings в одну матрицу и нормализуем на месте для косинусного сходства
         dimension = len(items_with_embeddings[0].embedding)
-        index = faiss.IndexFlatIP(dimension)  # Inner Product для косинусного сходства
+        embeddings_matrix = np.empty((len(items_with_embeddings), dimension), dtype=np.float32)
+        np.stack([item.embedding for item in items_with_embeddings], out=embeddings_matrix)
+        _normalize_rows(embeddings_matrix)
         
-        # Нормализуем embeddings для косинусного сходства
-        embeddings_matrix = np.array([item.embedding for item in items_with_embeddings])
-        faiss.normalize_L2(embeddings_matrix)
+        # Ищем похожих соседей сразу для всех векторов
+        similarities, indices = self._search_similar_embeddings(embeddings_matrix)
         
-        # Добавляем в индекс
-        index.add(embeddings_matrix)
+        # Находим дубли: кандидаты и порядок публикации считаем сразу для всех пар
+        count = len(items_with_embeddings)
+        pub_ts = np.fromiter((item.published_at.timestamp() for item in items_with_embeddings),
+                             dtype=np.float64, count=count)
+        candidates = (indices >= 0) & (indices != np.arange(count)[:, None]) & (similarities >= self.similarity_threshold)
+        neighbor_is_later = pub_ts[indices] > pub_ts[:, None]
         
-        # Находим дубли
         duplicates = set()
-        for i, item in enumerate(items_with_embeddings):
+        for i in np.flatnonzero(candidates.any(axis=1)):
             if i in duplicates:
                 continue
             
-            # Ищем похожие новости
-            query_vector = embeddings_matrix[i:i+1]
-            similarities, indices = index.search(query_vector, len(items_with_embeddings))
+            positions = np.flatnonzero(candidates[i])
+            later = neighbor_is_later[i, positions]
+            # Более поздние соседи (до первого не более позднего) - дубли текущей новости,
+            # первый не более поздний сосед делает дублем саму текущую новость
+            stop = int(np.argmin(later)) if not later.all() else len(positions)
             
-            # Находим дубли по порогу схожести
-            for sim, idx in zip(similarities[0], indices[0]):
-                if idx != i and sim >= self.similarity_threshold:
-                    # Отмечаем как дубль более позднюю новость
-                    if items_with_embeddings[idx].published_at > items_with_embeddings[i].published_at:
-                        duplicates.add(idx)
-                        items_with_embeddings[idx].is_duplicate = True
-                        items_with_embeddings[idx].duplicate_of = items_with_embeddings[i].url
-                        items_with_embeddings[idx].similarity_score = float(sim)
-                    else:
-                        duplicates.add(i)
-                        items_with_embeddings[i].is_duplicate = True
-                        items_with_embeddings[i].duplicate_of = items_with_embeddings[idx].url
-                        items_with_embeddings[i].similarity_score = float(sim)
-                        break
+            for position in positions[:stop]:
+                idx = int(indices[i, position])
+                duplicates.add(idx)
+                items_with_embeddings[idx].is_duplicate = True
+                items_with_embeddings[idx].duplicate_of = items_with_embeddings[i].url
+                items_with_embeddings[idx].similarity_score = float(similarities[i, position])
+
+            if stop < len(positions):
+                position = positions[stop]
+                duplicates.add(int(i))
+                items_with_embeddings[i].is_duplicate = True
+                items_with_embeddings[i].duplicate_of = items_with_embeddings[int(indices[i, position])].url
+                items_with_embeddings[i].similarity_score = float(similarities[i, position])
         
         # Возвращаем только уникальные новости
         unique_items = [item for i, item in enumerate(items_with_embeddings) if i not in duplicates]
@@ -400,20 +658,16 @@ class NewsProcessingChain:
         
         # Дефолтные критерии
         if criteria is None:
-            criteria = """
-            1. Глобальная важность и влияние на мировую экономику
-            2. Актуальность и новизна информации
-            3. Достоверность источника
-            4. Потенциальное влияние на технологические рынки
-            5. Социальная значимость
-            """
+            criteria = DEFAULT_RANKING_CRITERIA
+
+        # Тот же набор новостей с теми же критериями уже ранжировался - LLM не вызываем
+        cache_key = self._ranking_cache_key(news_items, criteria)
+        cached_ranking = self._get_cached_ranking(cache_key, news_items)
+        if cached_ranking is not None:
+            return cached_ranking
         
         # Подготавливаем данные для ранжирования
-        news_for_ranking = []
-        for i, item in enumerate(news_items):
-            news_for_ranking.append(f"{i+1}. {item.get_content_for_ranking()}\nURL: {item.url}\n")
-        
-        news_text = "\n".join(news_for_ranking)
+        news_text = self._format_news_for_ranking(news_items)
         
         def _rank_news_batch():
             """Внутренняя функция для ранжирования"""
@@ -428,6 +682,7 @@ class NewsProcessingChain:
             
             # Обрабатываем результат
             ranked_items = self._process_ranking_result(result, news_items)
+            self._store_ranking(cache_key, ranked_items)
             
             self.logger.info(f"Successfully ranked {len(ranked_items)} news items")
             return ranked_items
@@ -438,6 +693,109 @@ class NewsProcessingChain:
             for item in news_items:
                 item.relevance_score = 5.0
             return news_items
+
+    async def arank_news(self,
+                         news_items: List[NewsItem],
+                         criteria: str = None,
+                         group_size: int = RANKING_GROUP_SIZE) -> List[NewsItem]:
+        """
+        Асинхронное ранжирование новостей группами с параллельными вызовами LLM
+
+        Каждая группа ранжируется отдельным коротким запросом; одновременно
+        выполняется не более RANKING_MAX_CONCURRENCY запросов. Если группу
+        ранжировать не удалось, ее новости получают дефолтную оценку.
+
+        Args:
+            news_items: Список новостей
+            criteria: Критерии ранжирования
+            group_size: Количество новостей в одном запросе к LLM
+
+        Returns:
+            Список ранжированных новостей
+        """
+        self.logger.info(f"Ranking {len(news_items)} news items in groups of {group_size}")
+
+        if not news_items:
+            return news_items
+
+        if criteria is None:
+            criteria = DEFAULT_RANKING_CRITERIA
+
+        groups = [news_items[start:start + group_size] for start in range(0, len(news_items), group_size)]
+        semaphore = asyncio.Semaphore(RANKING_MAX_CONCURRENCY)
+
+        async def _rank_group(group: List[NewsItem]) -> None:
+            """Ранжирует одну группу новостей"""
+            cache_key = self._ranking_cache_key(group, criteria)
+            if self._get_cached_ranking(cache_key, group) is not None:
+                return
+            try:
+                async with semaphore:
+                    result = await self._aretry_with_backoff(self.ranking_chain.ainvoke, {
+                        "news_items": self._format_news_for_ranking(group),
+                        "criteria": criteria
+                    })
+                self._store_ranking(cache_key, self._process_ranking_result(result, group))
+            except Exception as e:
+                self.logger.error(f"Failed to rank group of {len(group)} news: {str(e)}")
+                for item in group:
+                    item.relevance_score = 5.0
+
+        await asyncio.gather(*(_rank_group(group) for group in groups))
+
+        ranked_items = sorted(news_items, key=lambda x: x.relevance_score, reverse=True)
+        self.logger.info(f"Successfully ranked {len(ranked_items)} news items")
+        return ranked_items
+
+    @staticmethod
+    def _ranking_cache_key(news_items: List[NewsItem], criteria: str) -> str:
+        """Ключ кэша ранжирования: критерии и множество URL новостей"""
+        urls = sorted(item.url for item in news_items)
+        return hashlib.sha256("\0".join([criteria, *urls]).encode("utf-8")).hexdigest()
+
+    def _get_cached_ranking(self, cache_key: str, news_items: List[NewsItem]) -> Optional[List[NewsItem]]:
+        """
+        Применяет сохраненные оценки, если набор новостей уже ранжировался
+
+        Args:
+            cache_key: Ключ кэша ранжирования
+            news_items: Список новостей
+
+        Returns:
+            Ранжированный список новостей или None, если в кэше нет результата
+        """
+        url_to_score = self._ranking_cache.get(cache_key)
+        if url_to_score is None:
+            return None
+
+        self._ranking_cache.move_to_end(cache_key)
+        for item in news_items:
+            item.relevance_score = url_to_score.get(item.url, 5.0)
+        self.logger.info(f"Using cached ranking for {len(news_items)} news items")
+        return sorted(news_items, key=lambda x: x.relevance_score, reverse=True)
+
+    def _store_ranking(self, cache_key: str, ranked_items: List[NewsItem]) -> None:
+        """Сохраняет оценки успешного ранжирования в кэш"""
+        self._ranking_cache[cache_key] = {item.url: item.relevance_score for item in ranked_items}
+        self._ranking_cache.move_to_end(cache_key)
+        while len(self._ranking_cache) > RANKING_CACHE_SIZE:
+            self._ranking_cache.popitem(last=False)
+
+    @staticmethod
+    def _format_news_for_ranking(news_items: List[NewsItem]) -> str:
+        """
+        Формирует текст списка новостей для промпта ранжирования
+
+        Args:
+            news_items: Список новостей
+
+        Returns:
+            Нумерованный список новостей с URL
+        """
+        return "\n".join(
+            f"{i+1}. {item.get_content_for_ranking()}\nURL: {item.url}\n"
+            for i, item in enumerate(news_items)
+        )
     
     def _process_ranking_result(self, result: str, news_items: List[NewsItem]) -> List[NewsItem]:
         """
@@ -472,8 +830,7 @@ class NewsProcessingChain:
                 json_text = result_text
             else:
                 # Пытаемся найти JSON объект в тексте
-                import re
-                json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
+                json_match = _JSON_OBJECT_RE.search(result_text)
                 if json_match:
                     json_text = json_match.group(0)
                 else:
@@ -589,6 +946,63 @@ class NewsProcessingChain:
         self.logger.info(f"Processing complete: {len(ranked_items)} final items")
         return ranked_items
 
+    async def aprocess_news(self,
+                            news_items: List[NewsItem],
+                            ranking_criteria: str = None,
+                            fail_on_errors: bool = False) -> List[NewsItem]:
+        """
+        Асинхронная полная обработка новостей: embeddings -> дедупликация -> ранжирование
+
+        Запросы к OpenAI не блокируют event loop, дедупликация (CPU) выполняется
+        в отдельном потоке, ранжирование идет группами параллельно (arank_news).
+        Обработка ошибок такая же, как в process_news.
+
+        Args:
+            news_items: Список новостей
+            ranking_criteria: Критерии ранжирования
+            fail_on_errors: Если True, прерывает обработку при ошибках, иначе продолжает с частичными результатами
+
+        Returns:
+            Список обработанных и ранжированных новостей
+        """
+        self.logger.info(f"Processing {len(news_items)} news items (async)")
+
+        if not news_items:
+            return news_items
+
+        # Ограничиваем количество для обработки
+        if len(news_items) > self.max_news_items:
+            self.logger.warning(f"Too many items ({len(news_items)}), processing only {self.max_news_items}")
+            news_items = news_items[:self.max_news_items]
+
+        processed_items = news_items.copy()
+
+        try:
+            # Шаг 1: Создание embeddings
+            processed_items = await self.acreate_embeddings(processed_items)
+        except EmbeddingError as e:
+            if fail_on_errors:
+                raise
+            self.logger.error(f"Embeddings failed, skipping deduplication: {str(e)}")
+
+        try:
+            # Шаг 2: Дедупликация (только если есть embeddings)
+            if processed_items and processed_items[0].embedding is not None:
+                unique_items = await asyncio.to_thread(self.deduplicate_news, processed_items)
+            else:
+                unique_items = processed_items
+        except Exception as e:
+            if fail_on_errors:
+                raise LLMProcessingError(f"Deduplication failed: {str(e)}")
+            self.logger.error(f"Deduplication failed, using all items: {str(e)}")
+            unique_items = processed_items
+
+        # Шаг 3: Ранжирование (ошибки групп обрабатываются внутри arank_news)
+        ranked_items = await self.arank_news(unique_items, ranking_criteria)
+
+        self.logger.info(f"Processing complete: {len(ranked_items)} final items")
+        return ranked_items
+
 
 def create_news_processing_chain(openai_client: Optional[OpenAIClient] = None,
                                **kwargs) -> NewsProcessingChain:
@@ -1,13 +1,75 @@
 # /src/logger.py
 # Настройка логирования 
 
+import atexit
+import functools
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 from src.config import get_log_level
 
 
+def _stop_listener(listener: QueueListener) -> None:
+    """Останавливает QueueListener, если он еще работает (повторный stop() падает)"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_listener(log_file: str, max_bytes: int, backup_count: int) -> QueueListener:
+    """
+    Возвращает общий для всех логгеров фоновый слушатель, пишущий в файл с ротацией.
+
+    Один RotatingFileHandler и один поток на файл: логгеры модулей не открывают
+    файл заново и не ротируют его независимо друг от друга.
+
+    Args:
+        log_file: Путь к файлу логов
+        max_bytes: Максимальный размер файла лога в байтах
+        backup_count: Количество резервных файлов
+
+    Returns:
+        Запущенный QueueListener с RotatingFileHandler
+    """
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8'
+    )
+    # Уровень и формат задает QueueHandler каждого логгера: сюда приходят готовые строки
+    listener = QueueListener(queue.SimpleQueue(), file_handler)
+    listener.start()
+    # При завершении процесса дописываем оставшиеся в очереди записи
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+def _create_queued_handler(listener: QueueListener, level: int, formatter: logging.Formatter) -> QueueHandler:
+    """
+    Создает QueueHandler логгера, передающий записи в фоновый слушатель.
+
+    Сообщение форматируется в потоке вызывающего кода, запись в файл выполняется
+    в потоке QueueListener.
+
+    Args:
+        listener: Фоновый слушатель файла логов
+        level: Уровень логирования handler
+        formatter: Форматтер для записей
+
+    Returns:
+        QueueHandler; слушатель доступен в атрибуте listener
+    """
+    queue_handler = QueueHandler(listener.queue)
+    queue_handler.setLevel(level)
+    queue_handler.setFormatter(formatter)
+    queue_handler.listener = listener
+    return queue_handler
+
+
 def setup_logger(
     name: str = "coffee_grinder",
     log_file: Optional[str] = None,
@@ -57,21 +119,15 @@ def setup_logger(
     # Файловый handler с ротацией (по умолчанию включен)
     if log_file is None:
         # Дефолтный путь для файла логов
-        import os
-        os.makedirs("/app/logs", exist_ok=True)
+        if not os.path.isdir("/app/logs"):
+            os.makedirs("/app/logs", exist_ok=True)
         log_file = "/app/logs/app.log"
     
     if log_file:
         try:
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=max_bytes,
-                backupCount=backup_count,
-                encoding='utf-8'
-            )
-            file_handler.setLevel(log_level)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            # Запись в файл уходит в общий фоновый поток, чтобы не блокировать вызывающий код
+            listener = _get_file_listener(log_file, max_bytes, backup_count)
+            logger.addHandler(_create_queued_handler(listener, log_level, formatter))
         except Exception as e:
             # Если не можем создать файл, просто продолжаем без файлового логирования
             print(f"Warning: Could not create log file {log_file}: {e}")
@@ -1,9 +1,12 @@
 # src/openai_client.py
 
+import asyncio
+import functools
 import time
 import random
-from typing import List, Dict, Any, Optional, Union
-from openai import OpenAI
+from typing import Awaitable, Callable, List, Dict, Any, Optional, TypeVar, Union
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI, DefaultHttpxClient
 from openai.types.chat import ChatCompletion
 from openai.types import CreateEmbeddingResponse
 import openai
@@ -11,14 +14,28 @@ import openai
 from src.config import get_ai_settings
 from src.logger import setup_logger
 
+# Лимиты пула соединений к API: keep-alive соединения переиспользуются между запросами
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+
+T = TypeVar("T")
+
+# Коды ответа, при которых запрос имеет смысл повторить (rate limit, таймауты, сбои сервера)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
 
 class OpenAIClientError(Exception):
     """Базовое исключение для ошибок OpenAI клиента"""
     
-    def __init__(self, message: str, status_code: Optional[int] = None, attempt: int = 1):
+    def __init__(self, message: str, status_code: Optional[int] = None, attempt: int = 1,
+                 retry_after: Optional[float] = None):
         self.message = message
         self.status_code = status_code
         self.attempt = attempt
+        self.retry_after = retry_after
         super().__init__(self.message)
 
 
@@ -29,7 +46,9 @@ class OpenAIClient:
                  api_key: Optional[str] = None,
                  max_retries: int = 3,
                  backoff_factor: float = 2.0,
-                 timeout: int = 60):
+                 timeout: int = 60,
+                 max_concurrency: int = 8,
+                 max_retry_time: Optional[float] = None):
         """
         Инициализация OpenAI клиента
         
@@ -38,37 +57,132 @@ class OpenAIClient:
             max_retries: Максимальное количество попыток при ошибках
             backoff_factor: Коэффициент для экспоненциального backoff
             timeout: Таймаут запросов в секундах
+            max_concurrency: Максимальное количество одновременных асинхронных запросов
+            max_retry_time: Общий лимит времени на все попытки одного запроса в секундах
+                (если None, ограничено только max_retries)
         """
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         self.timeout = timeout
-        self._logger = None
+        self.max_concurrency = max_concurrency
+        self.max_retry_time = max_retry_time
+        self.logger = setup_logger(__name__)
+        self._async_client = None
+        self._semaphore = None
+        self._semaphore_loop = None
+
+        # Настройки читаем один раз: из них же берутся модели по умолчанию
+        settings = None
+        try:
+            settings = get_ai_settings()
+        except Exception:
+            # Без настроек можно работать только с явно переданным API ключом
+            if api_key is None:
+                raise
         
         # Получаем API ключ
         if api_key is None:
-            settings = get_ai_settings()
             api_key = settings.OPENAI_API_KEY
         
-        # Инициализируем клиент
+        # Модели по умолчанию (fallback, если настройки недоступны)
+        self.default_chat_model = settings.OPENAI_MODEL if settings else "gpt-4o-mini"
+        self.default_embedding_model = settings.OPENAI_EMBEDDING_MODEL if settings else "text-embedding-3-small"
+
+        # Инициализируем клиент с общим пулом соединений, чтобы не платить
+        # за TCP+TLS handshake на каждый запрос
+        self._http_client = DefaultHttpxClient(limits=HTTP_POOL_LIMITS, timeout=timeout)
         self.client = OpenAI(
             api_key=api_key,
-            timeout=timeout
+            timeout=timeout,
+            http_client=self._http_client
         )
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Ленивое создание асинхронного клиента (синхронные вызовы за него не платят)"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.client.api_key,
+                timeout=self.timeout,
+                # Пул соединений по размеру ограничения параллельности: лишние
+                # запросы ждут на семафоре, а не в очереди пула httpx
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=self.max_concurrency,
+                        max_connections=self.max_concurrency * 2,
+                        keepalive_expiry=HTTP_POOL_LIMITS.keepalive_expiry
+                    ),
+                    timeout=self.timeout
+                )
+            )
+        return self._async_client
     
     @property
-    def logger(self):
-        """Ленивое создание логгера"""
-        if self._logger is None:
-            self._logger = setup_logger(__name__)
-        return self._logger
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        Ограничение числа одновременных асинхронных запросов
+
+        Создается лениво и заново для каждого event loop: семафор привязывается
+        к loop, а общий клиент может использоваться из нескольких asyncio.run.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def close(self) -> None:
+        """Закрывает пул HTTP соединений клиента"""
+        self._http_client.close()
+
+    async def aclose(self) -> None:
+        """Закрывает пулы HTTP соединений синхронного и асинхронного клиентов"""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.close()
+
+    def __enter__(self) -> "OpenAIClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
     
     def _exponential_backoff(self, attempt: int) -> float:
-        """Вычисляет время задержки для экспоненциального backoff"""
+        """
+        Вычисляет время задержки для экспоненциального backoff с full jitter
+
+        Задержка выбирается равномерно из [0, min(max_delay, base * factor^attempt)],
+        чтобы клиенты, одновременно получившие 429, не повторяли запросы синхронно.
+        """
         base_delay = 1.0  # Базовая задержка в секундах
         max_delay = 60.0  # Максимальная задержка
         
-        delay = base_delay * (self.backoff_factor ** attempt) + random.uniform(0, 1)
-        return min(delay, max_delay)
+        return random.uniform(0, min(max_delay, base_delay * (self.backoff_factor ** attempt)))
+
+    def _retry_delay(self, error: OpenAIClientError, attempt: int) -> float:
+        """Задержка перед повтором: backoff, но не меньше Retry-After от сервера"""
+        delay = self._exponential_backoff(attempt)
+        if error.retry_after is not None:
+            delay = max(delay, min(error.retry_after, 60.0))
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(error: Exception) -> Optional[float]:
+        """Достает Retry-After (в секундах) из заголовков ответа, если он есть"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        if not headers:
+            return None
+        try:
+            retry_after_ms = headers.get('retry-after-ms')
+            if retry_after_ms is not None:
+                return float(retry_after_ms) / 1000
+            retry_after = headers.get('retry-after')
+            if retry_after is not None:
+                return float(retry_after)
+        except (TypeError, ValueError):
+            # Формат HTTP-date не поддерживаем - используем обычный backoff
+            pass
+        return None
     
     def _handle_openai_error(self, error: Exception, attempt: int) -> OpenAIClientError:
         """Обрабатывает ошибки OpenAI и возвращает унифицированное исключение"""
@@ -76,7 +190,8 @@ class OpenAIClient:
             return OpenAIClientError(
                 f"Rate limit exceeded: {str(error)}", 
                 status_code=429, 
-                attempt=attempt
+                attempt=attempt,
+                retry_after=self._parse_retry_after(error)
             )
         elif isinstance(error, openai.APITimeoutError):
             return OpenAIClientError(
@@ -109,6 +224,113 @@ class OpenAIClient:
                 attempt=attempt
             )
     
+    def _should_retry(self, error: OpenAIClientError, attempt: int) -> bool:
+        """Нужно ли повторять запрос после ошибки на попытке attempt (с 0)"""
+        # Для rate limit, таймаутов, сбоев сервера и connection errors пытаемся повторить,
+        # для других ошибок или исчерпанных попыток - прерываем
+        return (
+            (error.status_code in RETRYABLE_STATUS_CODES or error.status_code is None)
+            and attempt < self.max_retries - 1
+        )
+
+    def _retry_deadline(self) -> Optional[float]:
+        """Момент (по time.monotonic), после которого повторы не начинаются"""
+        if self.max_retry_time is None:
+            return None
+        return time.monotonic() + self.max_retry_time
+
+    def _with_retries(self, op_name: str, func: Callable[[], T]) -> T:
+        """
+        Выполняет запрос к API с retry логикой
+
+        Args:
+            op_name: Название операции для логов
+            func: Функция без аргументов, выполняющая запрос
+
+        Returns:
+            Результат func
+
+        Raises:
+            OpenAIClientError: При ошибках API после всех попыток
+        """
+        last_error = None
+        last_exception = None
+        deadline = self._retry_deadline()
+
+        for attempt in range(self.max_retries):
+            try:
+                self.logger.debug(f"{op_name}, attempt {attempt + 1}/{self.max_retries}")
+                return func()
+
+            except Exception as e:
+                error = self._handle_openai_error(e, attempt + 1)
+                last_error = error
+                last_exception = e
+
+                self.logger.warning(f"{op_name} failed: {error.message}")
+
+                if not self._should_retry(error, attempt):
+                    break
+
+                delay = self._retry_delay(error, attempt)
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    self.logger.warning(f"{op_name}: retry time limit of {self.max_retry_time}s exceeded")
+                    break
+                self.logger.info(f"Waiting {delay:.2f} seconds before retry...")
+                time.sleep(delay)
+
+        # Если дошли сюда, значит все попытки исчерпаны
+        self.logger.error(f"{op_name} failed after {self.max_retries} attempts: {last_error.message}")
+        # Сохраняем исходное исключение SDK в цепочке (__cause__) для отладки
+        raise last_error from last_exception
+
+    async def _awith_retries(self, op_name: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Асинхронная версия _with_retries: ожидание между попытками не блокирует event loop
+
+        Args:
+            op_name: Название операции для логов
+            func: Функция без аргументов, возвращающая awaitable запроса
+
+        Returns:
+            Результат func
+
+        Raises:
+            OpenAIClientError: При ошибках API после всех попыток
+        """
+        last_error = None
+        last_exception = None
+        deadline = self._retry_deadline()
+
+        for attempt in range(self.max_retries):
+            try:
+                self.logger.debug(f"{op_name}, attempt {attempt + 1}/{self.max_retries}")
+                # Ждем под семафором только сам запрос, паузы между попытками - вне его
+                async with self.semaphore:
+                    return await func()
+
+            except Exception as e:
+                error = self._handle_openai_error(e, attempt + 1)
+                last_error = error
+                last_exception = e
+
+                self.logger.warning(f"{op_name} failed: {error.message}")
+
+                if not self._should_retry(error, attempt):
+                    break
+
+                delay = self._retry_delay(error, attempt)
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    self.logger.warning(f"{op_name}: retry time limit of {self.max_retry_time}s exceeded")
+                    break
+                self.logger.info(f"Waiting {delay:.2f} seconds before retry...")
+                await asyncio.sleep(delay)
+
+        # Если дошли сюда, значит все попытки исчерпаны
+        self.logger.error(f"{op_name} failed after {self.max_retries} attempts: {last_error.message}")
+        # Сохраняем исходное исключение SDK в цепочке (__cause__) для отладки
+        raise last_error from last_exception
+
     def create_chat_completion(self, 
                              messages: List[Dict[str, str]], 
                              model: Optional[str] = None,
@@ -130,47 +352,20 @@ class OpenAIClient:
             OpenAIClientError: При ошибках API после всех попыток
         """
         if model is None:
-            try:
-                settings = get_ai_settings()
-                model = settings.OPENAI_MODEL
-            except Exception:
-                model = "gpt-4o-mini"  # Fallback модель
+            model = self.default_chat_model
         
-        last_error = None
-        
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.debug(f"Creating chat completion, attempt {attempt + 1}/{self.max_retries}")
-                
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-                
-                self.logger.info(f"Successfully created chat completion with {len(messages)} messages")
-                return response
-                
-            except Exception as e:
-                error = self._handle_openai_error(e, attempt + 1)
-                last_error = error
-                
-                self.logger.warning(f"Chat completion failed: {error.message}")
-                
-                # Для rate limit и connection errors пытаемся повторить
-                if (error.status_code in [429, 408] or error.status_code is None) and attempt < self.max_retries - 1:
-                    delay = self._exponential_backoff(attempt)
-                    self.logger.info(f"Waiting {delay:.2f} seconds before retry...")
-                    time.sleep(delay)
-                    continue
-                else:
-                    # Для других ошибок или исчерпанных попыток - прерываем
-                    break
+        response = self._with_retries(
+            "Chat completion",
+            lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        )
         
-        # Если дошли сюда, значит все попытки исчерпаны
-        self.logger.error(f"Chat completion failed after {self.max_retries} attempts: {last_error.message}")
-        raise last_error
+        self.logger.info(f"Successfully created chat completion with {len(messages)} messages")
+        return response
     
     def create_embeddings(self, 
                          texts: Union[str, List[str]], 
@@ -189,70 +384,159 @@ class OpenAIClient:
             OpenAIClientError: При ошибках API после всех попыток
         """
         if model is None:
-            try:
-                settings = get_ai_settings()
-                model = settings.OPENAI_EMBEDDING_MODEL
-            except Exception:
-                model = "text-embedding-3-small"  # Fallback модель
+            model = self.default_embedding_model
         
-        # Приводим к списку для унификации
-        if isinstance(texts, str):
-            texts = [texts]
+        # Приводим к списку для унификации, длину считаем один раз
+        inputs = [texts] if isinstance(texts, str) else texts
+        texts_count = len(inputs)
         
-        last_error = None
+        response = self._with_retries(
+            "Embeddings creation",
+            lambda: self.client.embeddings.create(
+                model=model,
+                input=inputs
+            )
+        )
         
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.debug(f"Creating embeddings for {len(texts)} texts, attempt {attempt + 1}/{self.max_retries}")
-                
-                response = self.client.embeddings.create(
-                    model=model,
-                    input=texts
-                )
-                
-                self.logger.info(f"Successfully created embeddings for {len(texts)} texts")
-                return response
-                
-            except Exception as e:
-                error = self._handle_openai_error(e, attempt + 1)
-                last_error = error
-                
-                self.logger.warning(f"Embeddings creation failed: {error.message}")
-                
-                # Для rate limit и connection errors пытаемся повторить
-                if (error.status_code in [429, 408] or error.status_code is None) and attempt < self.max_retries - 1:
-                    delay = self._exponential_backoff(attempt)
-                    self.logger.info(f"Waiting {delay:.2f} seconds before retry...")
-                    time.sleep(delay)
-                    continue
-                else:
-                    # Для других ошибок или исчерпанных попыток - прерываем
-                    break
+        self.logger.info(f"Successfully created embeddings for {texts_count} texts")
+        return response
+
+    async def acreate_chat_completion(self,
+                                      messages: List[Dict[str, str]],
+                                      model: Optional[str] = None,
+                                      temperature: float = 0.7,
+                                      max_tokens: Optional[int] = None) -> ChatCompletion:
+        """
+        Асинхронная версия create_chat_completion
+
+        Ожидание между попытками не блокирует event loop, поэтому несколько
+        запросов можно выполнять параллельно через asyncio.gather.
+
+        Args:
+            messages: Список сообщений для чата
+            model: Модель для использования (если None, берется из настроек)
+            temperature: Температура генерации
+            max_tokens: Максимальное количество токенов
+
+        Returns:
+            ChatCompletion ответ
+
+        Raises:
+            OpenAIClientError: При ошибках API после всех попыток
+        """
+        if model is None:
+            model = self.default_chat_model
+
+        response = await self._awith_retries(
+            "Chat completion",
+            lambda: self.async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        )
         
-        # Если дошли сюда, значит все попытки исчерпаны
-        self.logger.error(f"Embeddings creation failed after {self.max_retries} attempts: {last_error.message}")
-        raise last_error
+        self.logger.info(f"Successfully created chat completion with {len(messages)} messages")
+        return response
+
+    async def acreate_embeddings(self,
+                                 texts: Union[str, List[str]],
+                                 model: Optional[str] = None) -> CreateEmbeddingResponse:
+        """
+        Асинхронная версия create_embeddings
+
+        Args:
+            texts: Текст или список текстов для создания embeddings
+            model: Модель для использования (если None, берется из настроек)
+
+        Returns:
+            CreateEmbeddingResponse ответ
+
+        Raises:
+            OpenAIClientError: При ошибках API после всех попыток
+        """
+        if model is None:
+            model = self.default_embedding_model
 
+        # Приводим к списку для унификации, длину считаем один раз
+        inputs = [texts] if isinstance(texts, str) else texts
+        texts_count = len(inputs)
 
+        response = await self._awith_retries(
+            "Embeddings creation",
+            lambda: self.async_client.embeddings.create(
+                model=model,
+                input=inputs
+            )
+        )
+
+        self.logger.info(f"Successfully created embeddings for {texts_count} texts")
+        return response
+
+    def create_embeddings_batched(self,
+                                  texts: List[str],
+                                  model: Optional[str] = None,
+                                  batch_size: int = 512) -> List[List[float]]:
+        """
+        Создает embeddings для большого списка текстов пачками
+
+        Каждая пачка отправляется одним запросом (с retry логикой create_embeddings),
+        порядок векторов совпадает с порядком текстов.
+
+        Args:
+            texts: Список текстов
+            model: Модель для использования (если None, берется из настроек)
+            batch_size: Максимальное количество текстов в одном запросе
+
+        Returns:
+            Список векторов embeddings
+
+        Raises:
+            OpenAIClientError: При ошибках API после всех попыток
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            response = self.create_embeddings(texts[start:start + batch_size], model=model)
+            # API может вернуть элементы не по порядку - сортируем по index
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
+
+
+@functools.lru_cache(maxsize=4)
 def create_openai_client(api_key: Optional[str] = None,
                         max_retries: int = 3,
                         backoff_factor: float = 2.0,
-                        timeout: int = 60) -> OpenAIClient:
+                        timeout: int = 60,
+                        max_concurrency: int = 8,
+                        max_retry_time: Optional[float] = None) -> OpenAIClient:
     """
-    Удобная функция для создания OpenAI клиента
+    Удобная функция для получения OpenAI клиента
+
+    Клиенты кэшируются по набору параметров: все вызывающие с одинаковыми
+    параметрами разделяют один экземпляр и его пул соединений. Поэтому
+    возвращенный клиент нельзя закрывать вручную; для сброса (например, в тестах)
+    используйте create_openai_client.cache_clear().
     
     Args:
         api_key: API ключ OpenAI (если None, берется из настроек)
         max_retries: Максимальное количество попыток при ошибках
         backoff_factor: Коэффициент для экспоненциального backoff
         timeout: Таймаут запросов в секундах
+        max_concurrency: Максимальное количество одновременных асинхронных запросов
+        max_retry_time: Общий лимит времени на все попытки одного запроса в секундах
         
     Returns:
-        Экземпляр OpenAIClient
+        Общий экземпляр OpenAIClient
     """
     return OpenAIClient(
         api_key=api_key,
         max_retries=max_retries,
         backoff_factor=backoff_factor,
-        timeout=timeout
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+        max_retry_time=max_retry_time
     ) 
\ No newline at end of file
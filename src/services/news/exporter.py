@@ -1,18 +1,78 @@
 # /src/services/news/exporter.py
 # Экспорт в Google Sheets 
 
+import functools
 import json
-import os
+import logging
+import random
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime, timezone
 import gspread
+from gspread.exceptions import APIError
+from gspread.utils import ValueInputOption
+from google.auth.exceptions import RefreshError
 from google.oauth2.service_account import Credentials
 
 from src.config import get_google_settings
 from src.logger import setup_logger
 from src.langchain.news_chain import NewsItem
 
+# Максимальный размер тела одного запроса на запись (с запасом до рекомендованных 2 MB)
+MAX_PAYLOAD_BYTES = 1_800_000
+
+# Области доступа service account
+GOOGLE_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+)
+
+
+def _chunk_by_payload_size(rows: List[List[str]], max_bytes: int) -> Iterator[List[List[str]]]:
+    """
+    Делит строки на пачки, JSON-представление каждой из которых не больше max_bytes
+
+    Строка, которая сама по себе больше max_bytes, уходит отдельной пачкой.
+
+    Args:
+        rows: Строки для записи
+        max_bytes: Максимальный размер пачки в байтах
+
+    Yields:
+        Непустые списки строк в исходном порядке
+    """
+    chunk: List[List[str]] = []
+    chunk_size = 0
+    for row in rows:
+        # +1 на запятую между строками в JSON-массиве
+        row_size = len(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")) + 1
+        if chunk and chunk_size + row_size > max_bytes:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+        chunk.append(row)
+        chunk_size += row_size
+    if chunk:
+        yield chunk
+
+
+@functools.lru_cache(maxsize=4)
+def _load_credentials(service_account_path: str, scopes: Tuple[str, ...]) -> Credentials:
+    """
+    Загружает credentials service account из файла
+
+    Результат кэшируется: JSON ключа читается и разбирается, а RSA signer
+    создается один раз на процесс. После замены файла ключа нужен перезапуск
+    процесса или _load_credentials.cache_clear().
+    """
+    return Credentials.from_service_account_file(service_account_path, scopes=list(scopes))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_gspread_client(service_account_path: str, scopes: Tuple[str, ...]) -> gspread.Client:
+    """Возвращает общий авторизованный клиент gspread (и его HTTP сессию) для service account"""
+    return gspread.authorize(_load_credentials(service_account_path, scopes))
+
 
 class GoogleSheetsExportError(Exception):
     """Базовое исключение для ошибок экспорта в Google Sheets"""
@@ -37,11 +97,22 @@ class QuotaExceededError(GoogleSheetsExportError):
 class GoogleSheetsExporter:
     """Класс для экспорта новостей в Google Sheets"""
     
+    # Фиксированный набор атрибутов без __dict__: экспортер создается на каждую выгрузку
+    __slots__ = (
+        "worksheet_name", "max_retries", "retry_delay", "metadata_ttl", "settings", "spreadsheet_id",
+        "_client", "_spreadsheet", "_worksheet",
+        "_sheet_id", "_row_count", "_metadata_loaded_at", "_headers_written"
+    )
+
+    # Общий логгер всех экспортеров: настраивается один раз при импорте модуля
+    logger = setup_logger(__name__)
+
     def __init__(self, 
                  spreadsheet_id: Optional[str] = None,
                  worksheet_name: str = "News",
                  max_retries: int = 3,
-                 retry_delay: float = 1.0):
+                 retry_delay: float = 1.0,
+                 metadata_ttl: float = 30.0):
         """
         Инициализация экспортера Google Sheets
         
@@ -50,14 +121,21 @@ class GoogleSheetsExporter:
             worksheet_name: Имя листа в таблице
             max_retries: Максимальное количество повторных попыток
             retry_delay: Задержка между попытками (секунды)
+            metadata_ttl: Сколько get_export_summary доверяет закэшированным метаданным листа (секунды)
         """
         self.worksheet_name = worksheet_name
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._logger = None
+        self.metadata_ttl = metadata_ttl
         self._client = None
         self._spreadsheet = None
         self._worksheet = None
+        # Метаданные листа, известные локально: не перезапрашиваем их у API
+        self._sheet_id = None
+        self._row_count = None
+        self._metadata_loaded_at = 0.0
+        # Заголовки в листе уже есть: у найденного листа считаем, что да
+        self._headers_written = False
         
         # Получаем настройки Google
         self.settings = get_google_settings()
@@ -66,34 +144,18 @@ class GoogleSheetsExporter:
         # Инициализируем клиент
         self._setup_client()
     
-    @property
-    def logger(self):
-        """Ленивое создание логгера"""
-        if self._logger is None:
-            self._logger = setup_logger(__name__)
-        return self._logger
-    
     def _setup_client(self):
         """Настройка Google Sheets клиента"""
         try:
-            # Создаем credentials из файла
-            scopes = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-            
-            # Проверяем наличие файла с service account
             service_account_path = self.settings.GOOGLE_SERVICE_ACCOUNT_PATH
-            if not os.path.exists(service_account_path):
-                raise AuthenticationError(f"Google service account file not found: {service_account_path}")
-            
-            credentials = Credentials.from_service_account_file(
-                service_account_path, 
-                scopes=scopes
-            )
             
-            # Создаем клиент gspread
-            self._client = gspread.authorize(credentials)
+            # Клиент gspread (и credentials из файла) общий для всех экспортеров процесса.
+            # Отдельной проверки os.path.exists нет: файл открывается только при
+            # промахе кэша, и его отсутствие видно по FileNotFoundError
+            try:
+                self._client = _get_gspread_client(service_account_path, GOOGLE_SCOPES)
+            except FileNotFoundError:
+                raise AuthenticationError(f"Google service account file not found: {service_account_path}")
             
             self.logger.info(f"Google Sheets client initialized successfully using {service_account_path}")
             
@@ -114,6 +176,9 @@ class GoogleSheetsExporter:
             GoogleSheetsExportError: При других ошибках
         """
         if self._worksheet is not None:
+            # Лист создан, но запись заголовков тогда не удалась - повторяем
+            if not self._headers_written:
+                self._setup_headers()
             return self._worksheet
         
         try:
@@ -125,6 +190,7 @@ class GoogleSheetsExporter:
             # Пытаемся найти существующий лист
             try:
                 self._worksheet = self._spreadsheet.worksheet(self.worksheet_name)
+                self._headers_written = True
                 self.logger.info(f"Found existing worksheet: {self.worksheet_name}")
             except gspread.WorksheetNotFound:
                 # Создаем новый лист
@@ -133,11 +199,15 @@ class GoogleSheetsExporter:
                     rows=1000,
                     cols=20
                 )
+                self._headers_written = False
                 self.logger.info(f"Created new worksheet: {self.worksheet_name}")
                 
                 # Добавляем заголовки
                 self._setup_headers()
             
+            self._sheet_id = self._worksheet.id
+            self._row_count = self._worksheet.row_count
+            self._metadata_loaded_at = time.monotonic()
             return self._worksheet
             
         except gspread.SpreadsheetNotFound:
@@ -149,9 +219,36 @@ class GoogleSheetsExporter:
             self.logger.error(f"Worksheet name: {self.worksheet_name}")
             self.logger.error(f"Exception type: {type(e).__name__}")
             raise GoogleSheetsExportError(error_msg) from e
+
+    def invalidate_metadata(self):
+        """
+        Сбрасывает закэшированные таблицу, лист и его размеры
+
+        Нужен после изменений структуры листа в обход экспортера: следующее
+        обращение к листу заново запросит метаданные у API.
+        """
+        self._spreadsheet = None
+        self._worksheet = None
+        self._sheet_id = None
+        self._row_count = None
+        self._headers_written = False
+
+    def _grid_row_count(self, worksheet: gspread.Worksheet) -> int:
+        """Количество строк в сетке листа: из кэша, а если его нет - из метаданных gspread"""
+        if self._row_count is not None:
+            return self._row_count
+        return worksheet.row_count
     
     def _setup_headers(self):
-        """Настраивает заголовки в новом листе"""
+        """
+        Настраивает заголовки в новом листе
+
+        Заголовки записываются в диапазон первой строки без сдвига строк
+        (в отличие от insert_row) и только один раз для листа.
+        """
+        if self._headers_written:
+            return
+
         headers = [
             "Timestamp",
             "Title", 
@@ -172,8 +269,10 @@ class GoogleSheetsExporter:
             "Processing Date"
         ]
         
+        range_name = f"A1:{chr(ord('A') + len(headers) - 1)}1"
         try:
-            self._worksheet.insert_row(headers, 1)
+            self._worksheet.update([headers], range_name, value_input_option=ValueInputOption.raw)
+            self._headers_written = True
             self.logger.info("Headers added to worksheet")
         except Exception as e:
             self.logger.error(f"Failed to add headers: {str(e)}")
@@ -202,19 +301,23 @@ class GoogleSheetsExporter:
                 return func(*args, **kwargs)
             except Exception as e:
                 last_exception = e
-                error_message = str(e).lower()
+                # Классифицируем по HTTP статусу ответа, а не по тексту ошибки
+                status_code = e.response.status_code if isinstance(e, APIError) else None
                 
-                # Проверяем тип ошибки
-                if "quota" in error_message or "rate limit" in error_message or "429" in error_message:
+                if status_code == 429 or (status_code is not None and 500 <= status_code < 600):
                     if attempt < self.max_retries:
-                        delay = self.retry_delay * (2 ** attempt)  # Экспоненциальная задержка
-                        self.logger.warning(f"Quota exceeded, retrying in {delay}s (attempt {attempt + 1}/{self.max_retries + 1})")
+                        # Full jitter: равномерно от 0 до экспоненциальной границы
+                        delay = random.uniform(0, self.retry_delay * (2 ** attempt))
+                        reason = "Quota exceeded" if status_code == 429 else f"Server error {status_code}"
+                        self.logger.warning(f"{reason}, retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries + 1})")
                         time.sleep(delay)
                         continue
-                    else:
+                    elif status_code == 429:
                         raise QuotaExceededError(f"Google API quota exceeded after {self.max_retries + 1} attempts")
+                    else:
+                        raise GoogleSheetsExportError(f"Google Sheets API error: {str(e)}")
                 
-                elif "authentication" in error_message or "unauthorized" in error_message:
+                elif status_code in (401, 403) or isinstance(e, RefreshError):
                     raise AuthenticationError(f"Authentication failed: {str(e)}")
                 
                 else:
@@ -283,11 +386,13 @@ class GoogleSheetsExporter:
         """
         self.logger.info(f"Preparing export data for {len(news_items)} news items")
         
-        rows_data = []
-        current_time = datetime.now(timezone.utc).isoformat()
+        # Время берем один раз на всю выгрузку, а не на каждую строку
+        now = datetime.now(timezone.utc)
+        current_time = now.isoformat()
+        processing_date = now.strftime("%Y-%m-%d %H:%M:%S UTC")
         
-        for i, item in enumerate(news_items, 1):
-            row = [
+        rows_data = [
+            [
                 current_time,  # Timestamp
                 item.title or "",
                 item.description or "",
@@ -304,68 +409,121 @@ class GoogleSheetsExporter:
                 str(item.similarity_score) if item.similarity_score is not None else "",
                 "Yes" if item.is_duplicate else "No",
                 item.duplicate_of or "",
-                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+                processing_date
             ]
-            rows_data.append(row)
-            self.logger.info(f"Prepared row {i}: {item.title[:50]}...")
+            for item in news_items
+        ]
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, item in enumerate(news_items, 1):
+                self.logger.debug(f"Prepared row {i}: {item.title[:50]}...")
         
         self.logger.info(f"Prepared {len(rows_data)} rows for export")
         return rows_data
     
     def _append_rows(self, worksheet: gspread.Worksheet, rows_data: List[List[str]]):
-        """Добавляет строки к существующим данным, всегда начиная с колонки A"""
-        def _append():
-            self.logger.info(f"Attempting to append {len(rows_data)} rows to worksheet")
-            self.logger.info(f"First row data: {rows_data[0][:3] if rows_data else 'No data'}")
-            self.logger.info(f"Last row data: {rows_data[-1][:3] if rows_data else 'No data'}")
-            
-            # Определяем следующую пустую строку в колонке A
-            # Получаем все значения в колонке A чтобы найти последнюю заполненную строку
-            try:
-                column_a_values = worksheet.col_values(1)  # Колонка A (индекс 1)
-                next_row = len(column_a_values) + 1
-                self.logger.info(f"Found {len(column_a_values)} rows in column A, inserting from row {next_row}")
-            except Exception as e:
-                # Если не удалось получить данные колонки A, используем общий row_count
-                next_row = worksheet.row_count + 1
-                self.logger.warning(f"Could not get column A values ({e}), using row_count+1: {next_row}")
-            
+        """
+        Добавляет строки к существующим данным, всегда начиная с колонки A
+
+        Большие выгрузки отправляются несколькими запросами, каждый не больше
+        MAX_PAYLOAD_BYTES: Google рекомендует держать тело запроса в пределах 2 MB.
+        """
+        self.logger.info(f"Attempting to append {len(rows_data)} rows to worksheet")
+        self.logger.info(f"First row data: {rows_data[0][:3] if rows_data else 'No data'}")
+        self.logger.info(f"Last row data: {rows_data[-1][:3] if rows_data else 'No data'}")
+
+        # Определяем следующую пустую строку в колонке A
+        # Получаем все значения в колонке A чтобы найти последнюю заполненную строку
+        try:
+            column_a_values = worksheet.col_values(1)  # Колонка A (индекс 1)
+            next_row = len(column_a_values) + 1
+            self.logger.info(f"Found {len(column_a_values)} rows in column A, inserting from row {next_row}")
+        except Exception as e:
+            # Если не удалось получить данные колонки A, используем общий row_count
+            next_row = self._grid_row_count(worksheet) + 1
+            self.logger.warning(f"Could not get column A values ({e}), using row_count+1: {next_row}")
+
+        num_cols = len(rows_data[0]) if rows_data else 17  # Наши данные имеют 17 колонок
+        end_col_letter = chr(ord('A') + num_cols - 1)  # A=0, B=1, ..., Q=16
+
+        for chunk in _chunk_by_payload_size(rows_data, MAX_PAYLOAD_BYTES):
             # Формируем диапазон для вставки (начиная с колонки A)
-            num_cols = len(rows_data[0]) if rows_data else 17  # Наши данные имеют 17 колонок
-            end_col_letter = chr(ord('A') + num_cols - 1)  # A=0, B=1, ..., Q=16
-            range_name = f"A{next_row}:{end_col_letter}{next_row + len(rows_data) - 1}"
-            
-            self.logger.info(f"Inserting data into range: {range_name}")
-            
-            # Используем update вместо append_rows для точного контроля места вставки
-            result = worksheet.update(range_name, rows_data)
+            range_name = f"A{next_row}:{end_col_letter}{next_row + len(chunk) - 1}"
+            self.logger.info(f"Inserting {len(chunk)} rows into range: {range_name}")
             
+            # Используем update вместо append_rows для точного контроля места вставки;
+            # RAW: значения уже строки, серверный разбор дат и чисел не нужен
+            result = self._retry_with_backoff(
+                worksheet.update, chunk, range_name, value_input_option=ValueInputOption.raw
+            )
             self.logger.info(f"Google Sheets API response: {result}")
-            return result
+            next_row += len(chunk)
         
-        result = self._retry_with_backoff(_append)
-        self.logger.info(f"Appended {len(rows_data)} rows to worksheet, API result: {result}")
+        self.logger.info(f"Appended {len(rows_data)} rows to worksheet")
         
-        # Проверяем сколько строк реально добавилось
-        try:
-            new_row_count = worksheet.row_count
-            self.logger.info(f"Worksheet row count after append: {new_row_count}")
-        except Exception as e:
-            self.logger.warning(f"Could not get updated row count: {e}")
+        # Запись значений за границей сетки расширяет лист - учитываем это локально
+        self._row_count = max(self._grid_row_count(worksheet), next_row - 1)
+        self.logger.info(f"Worksheet row count after append: {self._row_count}")
     
     def _overwrite_data(self, worksheet: gspread.Worksheet, rows_data: List[List[str]]):
-        """Перезаписывает данные (оставляя заголовки)"""
-        def _clear_and_insert():
-            # Очищаем все кроме первой строки (заголовки)
-            if worksheet.row_count > 1:
-                worksheet.delete_rows(2, worksheet.row_count)
+        """
+        Перезаписывает данные (оставляя заголовки)
+
+        Очистка старых данных и запись новых уходят одним запросом
+        spreadsheets.batchUpdate: один HTTP round-trip и одна единица квоты на запись.
+        """
+        row_count = self._grid_row_count(worksheet)
+        body = {"requests": self._build_overwrite_requests(worksheet.id, row_count, rows_data)}
+        self._retry_with_backoff(worksheet.spreadsheet.batch_update, body)
+        # appendDimension мог добавить строки - обновляем размер без запроса к API
+        self._row_count = max(row_count, len(rows_data) + 1)
+        self.logger.info(f"Overwrote worksheet with {len(rows_data)} rows")
+
+    @staticmethod
+    def _build_overwrite_requests(sheet_id: int, row_count: int, rows_data: List[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Формирует подзапросы batchUpdate для перезаписи данных под заголовками
+
+        Args:
+            sheet_id: ID листа (sheetId)
+            row_count: Текущее количество строк в сетке листа
+            rows_data: Строки для записи (начиная со второй строки листа)
             
-            # Вставляем новые данные
-            if rows_data:
-                worksheet.insert_rows(rows_data, 2)
+        Returns:
+            Список подзапросов: очистка значений, расширение листа при необходимости, запись
+        """
+        requests: List[Dict[str, Any]] = []
         
-        self._retry_with_backoff(_clear_and_insert)
-        self.logger.info(f"Overwrote worksheet with {len(rows_data)} rows")
+        # Очищаем значения всех строк кроме первой (заголовки)
+        if row_count > 1:
+            requests.append({
+                "updateCells": {
+                    "range": {"sheetId": sheet_id, "startRowIndex": 1, "endRowIndex": row_count},
+                    "fields": "userEnteredValue"
+                }
+            })
+
+        if rows_data:
+            # updateCells не выходит за границы листа - добавляем недостающие строки
+            missing_rows = len(rows_data) + 1 - row_count
+            if missing_rows > 0:
+                requests.append({
+                    "appendDimension": {"sheetId": sheet_id, "dimension": "ROWS", "length": missing_rows}
+                })
+
+            # Значения передаем строками, чтобы сервер не распознавал числа и даты
+            requests.append({
+                "updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": 1, "columnIndex": 0},
+                    "rows": [
+                        {"values": [{"userEnteredValue": {"stringValue": value}} for value in row]}
+                        for row in rows_data
+                    ],
+                    "fields": "userEnteredValue"
+                }
+            })
+
+        return requests
     
     def get_export_summary(self) -> Dict[str, Any]:
         """
@@ -375,14 +533,17 @@ class GoogleSheetsExporter:
             Словарь с информацией о таблице и данных
         """
         try:
+            # Между экспортами лист могли изменить снаружи: по истечении TTL перечитываем метаданные
+            if time.monotonic() - self._metadata_loaded_at >= self.metadata_ttl:
+                self.invalidate_metadata()
             worksheet = self._get_worksheet()
             
             return {
                 "spreadsheet_id": self.spreadsheet_id,
                 "spreadsheet_title": self._spreadsheet.title if self._spreadsheet else "Unknown",
                 "worksheet_name": self.worksheet_name,
-                "total_rows": worksheet.row_count,
-                "data_rows": max(0, worksheet.row_count - 1),  # Исключаем заголовки
+                "total_rows": self._grid_row_count(worksheet),
+                "data_rows": max(0, self._grid_row_count(worksheet) - 1),  # Исключаем заголовки
                 "last_updated": datetime.now(timezone.utc).isoformat(),
                 "url": f"https://docs.google.com/spreadsheets/d/{self.spreadsheet_id}"
             }
@@ -1,12 +1,19 @@
 # src/services/news/fetcher_fabric.py
 
-from typing import Dict, Type, Optional
+import threading
+from typing import Any, Dict, Type, Optional, Tuple
 from .fetchers.base import BaseFetcher, FetcherRegistry
-from src.logger import setup_logger
 
 
 class FetcherFactory:
     """Фабрика для создания fetcher'ов новостей с автоматической регистрацией"""
+
+    # Созданные fetcher'ы: провайдер -> (объект настроек, fetcher).
+    # Fetcher переиспользуется, пока get_news_providers_settings() возвращает
+    # тот же объект настроек, поэтому его requests.Session и пул соединений
+    # живут между вызовами, а перезагрузка конфига сама сбрасывает кэш
+    _fetcher_cache: Dict[str, Tuple[Any, BaseFetcher]] = {}
+    _cache_lock = threading.Lock()
     
     @classmethod
     def create_fetcher_from_config(cls, provider: str) -> BaseFetcher:
@@ -43,8 +50,21 @@ class FetcherFactory:
         if not provider_settings.enabled:
             raise ValueError(f"Provider '{provider}' is disabled in configuration")
         
-        # Создаем fetcher используя метод create_from_config
-        return fetcher_class.create_from_config(provider_settings)
+        with cls._cache_lock:
+            cached = cls._fetcher_cache.get(provider)
+            if cached is not None and cached[0] is provider_settings and type(cached[1]) is fetcher_class:
+                return cached[1]
+
+            # Создаем fetcher используя метод create_from_config
+            fetcher = fetcher_class.create_from_config(provider_settings)
+            cls._fetcher_cache[provider] = (provider_settings, fetcher)
+            return fetcher
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Сбрасывает кэш созданных fetcher'ов"""
+        with cls._cache_lock:
+            cls._fetcher_cache.clear()
     
     @classmethod
     def get_available_providers(cls) -> list[str]:
@@ -3,7 +3,8 @@
 """
 
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -14,6 +15,9 @@ from src.langchain.news_chain import NewsProcessingChain, NewsItem, create_news_
 from src.services.news.exporter import GoogleSheetsExporter, create_google_sheets_exporter
 from src.services.news.rubrics_config import get_active_rubrics
 
+# Сколько запросов к провайдерам новостей выполняется одновременно
+MAX_PARALLEL_FETCHES = 4
+
 
 @dataclass
 class StageResult:
@@ -202,6 +206,9 @@ class NewsPipelineOrchestrator:
         failed_requests = 0
         warnings = []
         
+        # Сетевые запросы ко всем провайдерам идут параллельно, разбор ответов - по порядку
+        responses = self._fetch_responses(config_requests)
+
         for i, req in enumerate(config_requests):
             provider_name = req.get("provider")
             provider_url = req.get("url")
@@ -226,10 +233,9 @@ class NewsPipelineOrchestrator:
             self.logger.info(f"Config: {provider_config}")
             
             try:
-                fetcher = create_news_fetcher_from_config(provider_name)
-                
-                # Получаем новости через fetcher с новым интерфейсом
-                response = fetcher.fetch_news(url=provider_url, params=provider_config)
+                response = responses[i]
+                if isinstance(response, Exception):
+                    raise response
                 
                 # Проверяем на наличие ошибки
                 if "error" in response:
@@ -353,6 +359,35 @@ class NewsPipelineOrchestrator:
                     "warnings": warnings
                 }
             )
+
+    def _fetch_responses(self, config_requests: List[Dict[str, Any]]) -> Dict[int, Union[Dict[str, Any], Exception]]:
+        """
+        Параллельно выполняет запросы к провайдерам
+
+        Время этапа определяется самым медленным провайдером, а не суммой задержек.
+        Запросы без провайдера или URL пропускаются - их отбраковывает _run_fetch_stage.
+
+        Returns:
+            Словарь: индекс запроса -> ответ fetch_news или исключение
+        """
+        def fetch(req: Dict[str, Any]) -> Union[Dict[str, Any], Exception]:
+            try:
+                fetcher = create_news_fetcher_from_config(req["provider"])
+                # Получаем новости через fetcher с новым интерфейсом
+                return fetcher.fetch_news(url=req["url"], params=req.get("config", {}))
+            except Exception as e:
+                return e
+
+        indexed_requests = [
+            (i, req) for i, req in enumerate(config_requests)
+            if req.get("provider") and req.get("url")
+        ]
+        if not indexed_requests:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_FETCHES, len(indexed_requests))) as executor:
+            responses = executor.map(fetch, [req for _, req in indexed_requests])
+            return {i: response for (i, _), response in zip(indexed_requests, responses)}
     
     def _run_deduplication_stage(self, articles: List[NewsItem]) -> StageResult:
         """Выполняет этап дедупликации и ранжирования"""
@@ -0,0 +1,84 @@
+# tests/langchain/test_embedding_cache.py
+
+import sqlite3
+
+import numpy as np
+
+from src.langchain.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Тесты для кэша embeddings"""
+
+    def test_key_depends_on_model(self):
+        """Тест: один и тот же текст для разных моделей дает разные ключи"""
+        assert EmbeddingCache.make_key("model-a", "text") != EmbeddingCache.make_key("model-b", "text")
+        assert EmbeddingCache.make_key("model-a", "text") == EmbeddingCache.make_key("model-a", "text")
+
+    def test_memory_hit_and_miss(self):
+        """Тест попадания и промаха в кэше в памяти"""
+        cache = EmbeddingCache()
+
+        assert cache.get("model", "text") is None
+
+        cache.set("model", "text", [0.1, 0.2, 0.3])
+        vector = cache.get("model", "text")
+
+        assert vector.dtype == np.float32
+        np.testing.assert_array_equal(vector, np.array([0.1, 0.2, 0.3], dtype=np.float32))
+        assert cache.get("other-model", "text") is None
+
+    def test_lru_eviction(self):
+        """Тест вытеснения самой старой записи при переполнении"""
+        cache = EmbeddingCache(max_memory_items=2)
+        cache.set("model", "a", [1.0])
+        cache.set("model", "b", [2.0])
+        cache.get("model", "a")
+        cache.set("model", "c", [3.0])
+
+        assert len(cache) == 2
+        assert cache.get("model", "b") is None
+        assert cache.get("model", "a") is not None
+        assert cache.get("model", "c") is not None
+
+    def test_disk_cache_survives_new_instance(self, tmp_path):
+        """Тест: записи на диске доступны новому экземпляру кэша"""
+        path = str(tmp_path / "cache" / "embeddings.sqlite")
+        EmbeddingCache(path=path).set_many("model", ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+        cache = EmbeddingCache(path=path)
+
+        np.testing.assert_array_equal(cache.get("model", "b"), np.array([3.0, 4.0], dtype=np.float32))
+
+    def test_disk_cache_stores_float16(self, tmp_path):
+        """Тест: на диске векторы хранятся в float16, из кэша возвращаются в float32"""
+        path = str(tmp_path / "embeddings.sqlite")
+        original = np.random.default_rng(0).random(1536, dtype=np.float32)
+        EmbeddingCache(path=path).set("model", "a", original)
+
+        with sqlite3.connect(path) as connection:
+            (blob,) = connection.execute("SELECT vector FROM embeddings").fetchone()
+        vector = EmbeddingCache(path=path).get("model", "a")
+
+        assert len(blob) == 1536 * 2
+        assert vector.dtype == np.float32
+        np.testing.assert_allclose(vector, original, rtol=1e-3, atol=1e-3)
+
+    def test_disk_cache_ttl(self, tmp_path):
+        """Тест: просроченные записи на диске не возвращаются"""
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache(path=path).set("model", "a", [1.0])
+
+        cache = EmbeddingCache(path=path, ttl=-1)
+
+        assert cache.get("model", "a") is None
+
+    def test_clear(self, tmp_path):
+        """Тест очистки обоих уровней кэша"""
+        cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite"))
+        cache.set("model", "a", [1.0])
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("model", "a") is None
@@ -1,10 +1,12 @@
 # tests/langchain/test_news_chain.py
 
+import asyncio
 import pytest
 import numpy as np
 from datetime import datetime
-from unittest.mock import Mock, patch, MagicMock
-from src.langchain.news_chain import NewsItem, NewsProcessingChain
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from src.langchain.news_chain import NewsItem, NewsProcessingChain, _normalize_rows
+from src.langchain.embedding_cache import EmbeddingCache
 from src.openai_client import OpenAIClient
 import json
 
@@ -64,6 +66,20 @@ class TestNewsItem:
         assert result["duplicate_of"] == "https://example.com/original"
         assert result["similarity_score"] == 0.95
     
+    def test_news_item_has_no_instance_dict(self):
+        """Тест: NewsItem использует __slots__ и не принимает неизвестные атрибуты"""
+        news_item = NewsItem(
+            title="Test",
+            description="Test description",
+            url="https://example.com/test",
+            published_at=datetime(2025, 1, 15, 10, 0, 0),
+            source="example.com"
+        )
+
+        assert not hasattr(news_item, "__dict__")
+        with pytest.raises(AttributeError):
+            news_item.unknown_field = "value"
+
     def test_get_content_for_embedding(self):
         """Тест получения контента для эмбеддинга"""
         news_item = NewsItem(
@@ -109,6 +125,31 @@ class TestNewsItem:
         assert content == expected
 
 
+class TestNormalizeRows:
+    """Тесты для нормализации матрицы embeddings"""
+
+    def test_matches_faiss_normalize(self):
+        """Тест: результат совпадает с faiss.normalize_L2"""
+        import faiss
+
+        matrix = np.random.default_rng(0).random((5, 8), dtype=np.float32)
+        expected = matrix.copy()
+        faiss.normalize_L2(expected)
+
+        result = _normalize_rows(matrix)
+
+        assert result is matrix
+        np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+    def test_zero_row_stays_zero(self):
+        """Тест: нулевая строка не превращается в NaN"""
+        matrix = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+
+        _normalize_rows(matrix)
+
+        np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 0.0]])
+
+
 class TestNewsProcessingChain:
     """Тесты для класса NewsProcessingChain"""
     
@@ -193,6 +234,11 @@ class TestNewsProcessingChain:
             assert item.embedding.dtype == np.float32
             np.testing.assert_array_equal(item.embedding, np.array(mock_embeddings[i], dtype=np.float32))
         
+        # Embeddings батча - строки одной непрерывной матрицы
+        base = result[0].embedding.base
+        assert base is not None and base.shape == (3, 3) and base.flags.c_contiguous
+        assert all(item.embedding.base is base for item in result)
+
         # Проверяем что вызов был сделан с правильными текстами
         expected_texts = [item.get_content_for_embedding() for item in sample_news_items]
         mock_embeddings_instance.embed_documents.assert_called_once_with(expected_texts)
@@ -216,6 +262,110 @@ class TestNewsProcessingChain:
         
         with pytest.raises(Exception, match="OpenAI API error"):
             chain.create_embeddings(sample_news_items)
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.OpenAIEmbeddings')
+    def test_create_embeddings_uses_cache(self, mock_embeddings_class, mock_get_ai_settings, mock_openai_client, sample_news_items):
+        """Тест: повторные тексты берутся из кэша, в API уходят только промахи"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_embeddings_instance = Mock()
+        mock_embeddings_class.return_value = mock_embeddings_instance
+        mock_embeddings_instance.embed_documents.return_value = [[0.1, 0.2, 0.3]]
+
+        cache = EmbeddingCache()
+        texts = [item.get_content_for_embedding() for item in sample_news_items]
+        cache.set("text-embedding-3-small", texts[0], [1.0, 0.0, 0.0])
+        cache.set("text-embedding-3-small", texts[2], [0.0, 0.0, 1.0])
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client, embedding_cache=cache)
+        result = chain.create_embeddings(sample_news_items)
+
+        mock_embeddings_instance.embed_documents.assert_called_once_with([texts[1]])
+        np.testing.assert_array_equal(result[0].embedding, np.array([1.0, 0.0, 0.0], dtype=np.float32))
+        np.testing.assert_array_equal(result[1].embedding, np.array([0.1, 0.2, 0.3], dtype=np.float32))
+        np.testing.assert_array_equal(result[2].embedding, np.array([0.0, 0.0, 1.0], dtype=np.float32))
+
+        # Второй вызов полностью обслуживается кэшем
+        chain.create_embeddings(sample_news_items)
+        assert mock_embeddings_instance.embed_documents.call_count == 1
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.OpenAIEmbeddings')
+    def test_create_embeddings_deduplicates_texts(self, mock_embeddings_class, mock_get_ai_settings, mock_openai_client):
+        """Тест: одинаковые тексты отправляются в API один раз"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_embeddings_instance = Mock()
+        mock_embeddings_class.return_value = mock_embeddings_instance
+        mock_embeddings_instance.embed_documents.return_value = [[1.0, 0.0], [0.0, 1.0]]
+
+        published_at = datetime(2025, 1, 15, 10, 0, 0)
+        news_items = [
+            NewsItem("Same story", "Same text", "https://a.com/1", published_at, "a.com"),
+            NewsItem("Other story", "Other text", "https://b.com/1", published_at, "b.com"),
+            NewsItem("Same story", "Same text", "https://c.com/1", published_at, "c.com")
+        ]
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client)
+        result = chain.create_embeddings(news_items)
+
+        mock_embeddings_instance.embed_documents.assert_called_once_with([
+            news_items[0].get_content_for_embedding(),
+            news_items[1].get_content_for_embedding()
+        ])
+        np.testing.assert_array_equal(result[0].embedding, [1.0, 0.0])
+        np.testing.assert_array_equal(result[1].embedding, [0.0, 1.0])
+        np.testing.assert_array_equal(result[2].embedding, [1.0, 0.0])
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.OpenAIEmbeddings')
+    def test_acreate_embeddings(self, mock_embeddings_class, mock_get_ai_settings, mock_openai_client, sample_news_items):
+        """Тест асинхронного создания эмбеддингов через aembed_documents"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_embeddings_instance = Mock()
+        mock_embeddings_instance.aembed_documents = AsyncMock(return_value=[
+            [0.1, 0.2, 0.3],
+            [0.4, 0.5, 0.6],
+            [0.7, 0.8, 0.9]
+        ])
+        mock_embeddings_class.return_value = mock_embeddings_instance
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client)
+
+        result = asyncio.run(chain.acreate_embeddings(sample_news_items))
+
+        expected_texts = [item.get_content_for_embedding() for item in sample_news_items]
+        mock_embeddings_instance.aembed_documents.assert_awaited_once_with(expected_texts)
+        mock_embeddings_instance.embed_documents.assert_not_called()
+        np.testing.assert_array_equal(result[2].embedding, np.array([0.7, 0.8, 0.9], dtype=np.float32))
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.OpenAIEmbeddings')
+    def test_acreate_embeddings_failure(self, mock_embeddings_class, mock_get_ai_settings, mock_openai_client, sample_news_items):
+        """Тест: ошибка аутентификации в async варианте не повторяется и приводит к EmbeddingError"""
+        from src.langchain.news_chain import EmbeddingError
+
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_embeddings_instance = Mock()
+        mock_embeddings_instance.aembed_documents = AsyncMock(side_effect=Exception("Authentication failed"))
+        mock_embeddings_class.return_value = mock_embeddings_instance
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client)
+
+        with pytest.raises(EmbeddingError):
+            asyncio.run(chain.acreate_embeddings(sample_news_items))
+        assert mock_embeddings_instance.aembed_documents.await_count == 1
     
     @patch('src.langchain.news_chain.get_ai_settings')
     def test_deduplicate_news_empty_list(self, mock_get_ai_settings, mock_openai_client):
@@ -294,6 +444,72 @@ class TestNewsProcessingChain:
         assert news2.is_duplicate is True
         assert news2.duplicate_of == news1.url
         assert news2.similarity_score > 0.8
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    def test_deduplicate_news_small_batch_skips_faiss(self, mock_get_ai_settings, mock_openai_client):
+        """Тест: для небольших выборок FAISS индекс не создается"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client, similarity_threshold=0.8)
+
+        news_items = [
+            NewsItem("Title 1", "Description 1", "https://example.com/1", datetime(2025, 1, 15, 10, 0, 0), "source1"),
+            NewsItem("Title 2", "Description 2", "https://example.com/2", datetime(2025, 1, 15, 11, 0, 0), "source2")
+        ]
+        news_items[0].embedding = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        news_items[1].embedding = np.array([0.9, 0.1, 0.1], dtype=np.float32)
+
+        with patch('src.langchain.news_chain.faiss') as mock_faiss:
+            result = chain.deduplicate_news(news_items)
+
+        assert not mock_faiss.method_calls
+        assert [item.url for item in result] == ["https://example.com/1"]
+        assert news_items[1].duplicate_of == "https://example.com/1"
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    def test_deduplicate_news_large_batch_uses_ivf(self, mock_get_ai_settings, mock_openai_client):
+        """Тест: для больших выборок используется приближенный индекс IVF"""
+        import faiss
+
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        chain = NewsProcessingChain(openai_client=mock_openai_client, similarity_threshold=0.99)
+
+        vectors = np.eye(64, dtype=np.float32)
+        news_items = []
+        for i in range(64):
+            item = NewsItem(f"Title {i}", f"Description {i}", f"https://example.com/{i}",
+                            datetime(2025, 1, 15, 10, i % 60, 0), "source.com")
+            item.embedding = vectors[i]
+            news_items.append(item)
+        # Последняя новость - копия первой, опубликованная позже
+        news_items[-1].embedding = vectors[0].copy()
+
+        with patch('src.langchain.news_chain.ANN_INDEX_MIN_ITEMS', 32), \
+                patch('src.langchain.news_chain.faiss.IndexIVFFlat', wraps=faiss.IndexIVFFlat) as mock_ivf:
+            result = chain.deduplicate_news(news_items)
+
+        mock_ivf.assert_called_once()
+        assert len(result) == 63
+        assert news_items[-1].is_duplicate is True
+        assert news_items[-1].duplicate_of == news_items[0].url
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.ChatOpenAI')
+    def test_ranking_llm_uses_json_mode(self, mock_chat_openai, mock_get_ai_settings, mock_openai_client):
+        """Тест: LLM для ранжирования запрашивает ответ в JSON mode"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        NewsProcessingChain(openai_client=mock_openai_client)
+
+        _, kwargs = mock_chat_openai.call_args
+        assert kwargs["model_kwargs"] == {"response_format": {"type": "json_object"}}
     
     @patch('src.langchain.news_chain.get_ai_settings')
     def test_rank_news_empty_list(self, mock_get_ai_settings, mock_openai_client):
@@ -392,6 +608,97 @@ class TestNewsProcessingChain:
             assert len(result) == 3
             for item in result:
                 assert item.relevance_score == 5.0
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    def test_rank_news_uses_cache(self, mock_get_ai_settings, mock_openai_client, sample_news_items):
+        """Тест: повторное ранжирование того же набора с теми же критериями не вызывает LLM"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_chain = Mock()
+        mock_chain.invoke.return_value = json.dumps({"rankings": [
+            {"url": "https://example.com/ai-news", "score": 9, "reasoning": ""},
+            {"url": "https://example.com/market-news", "score": 6, "reasoning": ""},
+            {"url": "https://example.com/ai-revolution", "score": 8, "reasoning": ""}
+        ]})
+
+        with patch.object(NewsProcessingChain, '_create_ranking_chain', return_value=mock_chain):
+            chain = NewsProcessingChain(openai_client=mock_openai_client)
+
+            chain.rank_news(sample_news_items, criteria="test")
+            for item in sample_news_items:
+                item.relevance_score = 5.0
+            result = chain.rank_news(list(reversed(sample_news_items)), criteria="test")
+
+            assert mock_chain.invoke.call_count == 1
+            assert [item.relevance_score for item in result] == [9, 8, 6]
+
+            # Другие критерии - новый запрос к LLM
+            chain.rank_news(sample_news_items, criteria="other")
+            assert mock_chain.invoke.call_count == 2
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    def test_arank_news_groups(self, mock_get_ai_settings, mock_openai_client):
+        """Тест асинхронного ранжирования группами: по одному запросу на группу, общий порядок по оценке"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        news_items = [
+            NewsItem(f"Title {i}", f"Description {i}", f"https://example.com/{i}", datetime(2025, 1, 15, 10, 0, 0), "source")
+            for i in range(5)
+        ]
+
+        async def _ainvoke(inputs):
+            urls = [line[len("URL: "):] for line in inputs["news_items"].splitlines() if line.startswith("URL: ")]
+            if "https://example.com/4" in urls:
+                raise Exception("Authentication failed")
+            return json.dumps({"rankings": [{"url": url, "score": int(url[-1]) * 2 + 1, "reasoning": ""} for url in urls]})
+
+        mock_chain = Mock()
+        mock_chain.ainvoke = AsyncMock(side_effect=_ainvoke)
+
+        with patch.object(NewsProcessingChain, '_create_ranking_chain', return_value=mock_chain):
+            chain = NewsProcessingChain(openai_client=mock_openai_client)
+            result = asyncio.run(chain.arank_news(news_items, criteria="test", group_size=2))
+
+        assert mock_chain.ainvoke.await_count == 3
+        # Группа с ошибкой получает дефолтную оценку, остальные - оценки LLM
+        assert [item.url[-1] for item in result] == ["3", "2", "4", "1", "0"]
+        assert [item.relevance_score for item in result] == [7.0, 5.0, 5.0, 3.0, 1.0]
+
+    @patch('src.langchain.news_chain.get_ai_settings')
+    @patch('src.langchain.news_chain.OpenAIEmbeddings')
+    def test_aprocess_news(self, mock_embeddings_class, mock_get_ai_settings, mock_openai_client, sample_news_items):
+        """Тест асинхронной полной обработки: дубль удаляется, остальные ранжируются"""
+        mock_settings = Mock()
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_get_ai_settings.return_value = mock_settings
+
+        mock_embeddings_instance = Mock()
+        mock_embeddings_instance.aembed_documents = AsyncMock(return_value=[
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.99, 0.01, 0.0]  # Дубль первой новости, опубликован позже
+        ])
+        mock_embeddings_class.return_value = mock_embeddings_instance
+
+        mock_chain = Mock()
+        mock_chain.ainvoke = AsyncMock(return_value=json.dumps({"rankings": [
+            {"url": "https://example.com/ai-revolution", "score": 6, "reasoning": ""},
+            {"url": "https://example.com/market-news", "score": 8, "reasoning": ""}
+        ]}))
+
+        with patch.object(NewsProcessingChain, '_create_ranking_chain', return_value=mock_chain):
+            chain = NewsProcessingChain(openai_client=mock_openai_client)
+            result = asyncio.run(chain.aprocess_news(sample_news_items, ranking_criteria="test"))
+
+        assert [item.url for item in result] == [
+            "https://example.com/market-news",
+            "https://example.com/ai-revolution"
+        ]
+        assert sample_news_items[2].is_duplicate is True
     
     @patch('src.langchain.news_chain.get_ai_settings')
     def test_process_news_empty_list(self, mock_get_ai_settings, mock_openai_client):
@@ -502,20 +809,12 @@ class TestNewsProcessingChain:
         news_items[0].embedding = np.array([0.9, 0.1, 0.0], dtype=np.float32)
         news_items[1].embedding = np.array([0.95, 0.05, 0.0], dtype=np.float32)
         
-        # Мокаем FAISS для возврата высокой схожести
-        with patch('src.langchain.news_chain.faiss.IndexFlatIP') as mock_index_class:
-            mock_index = Mock()
-            mock_index_class.return_value = mock_index
-            mock_index.search.return_value = (
-                np.array([[0.95, 0.92]]),  # Высокая схожесть
-                np.array([[0, 1]])         # Индексы
-            )
-            
-            result = chain.deduplicate_news(news_items)
-            
-            # Когда время одинаковое, алгоритм может пометить обе новости как дубли
-            # Это корректное поведение для очень похожих новостей
-            assert len(result) == 0  # Обе новости считаются дублями друг друга
+        # Косинусное сходство эмбеддингов ~0.998 - выше порога 0.9
+        result = chain.deduplicate_news(news_items)
+
+        # Когда время одинаковое, алгоритм может пометить обе новости как дубли
+        # Это корректное поведение для очень похожих новостей
+        assert len(result) == 0  # Обе новости считаются дублями друг друга
 
     @patch('src.langchain.news_chain.get_ai_settings')
     @patch('src.langchain.news_chain.OpenAIEmbeddings')
@@ -0,0 +1,50 @@
+# tests/langchain/test_package_lazy_import.py
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestLangchainPackageLazyImport:
+    """Тесты ленивого импорта пакета src.langchain"""
+
+    def test_package_import_does_not_load_news_chain(self):
+        """Тест: импорт src.langchain не загружает news_chain до обращения к имени"""
+        code = (
+            "import sys\n"
+            "import src.langchain as package\n"
+            "assert 'src.langchain.news_chain' not in sys.modules\n"
+            "news_item = package.NewsItem\n"
+            "assert 'src.langchain.news_chain' in sys.modules\n"
+            "assert news_item is sys.modules['src.langchain.news_chain'].NewsItem\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_news_chain_import_does_not_load_heavy_dependencies(self):
+        """Тест: импорт news_chain не загружает faiss и langchain_openai до создания цепочки"""
+        code = (
+            "import sys\n"
+            "from src.langchain import news_chain\n"
+            "assert 'faiss' not in sys.modules\n"
+            "assert 'langchain_openai' not in sys.modules\n"
+            "assert news_chain.faiss is sys.modules['faiss']\n"
+            "assert news_chain.OpenAIEmbeddings is sys.modules['langchain_openai'].OpenAIEmbeddings\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True
+        )
+
+        assert result.returncode == 0, result.stderr
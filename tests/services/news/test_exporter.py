@@ -4,8 +4,13 @@ import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
+from gspread.exceptions import APIError, WorksheetNotFound
+
 from src.services.news.exporter import (
     GoogleSheetsExporter,
+    _chunk_by_payload_size,
+    _get_gspread_client,
+    _load_credentials,
     create_google_sheets_exporter,
     GoogleSheetsExportError,
     AuthenticationError,
@@ -15,6 +20,16 @@ from src.services.news.exporter import (
 from src.langchain.news_chain import NewsItem
 
 
+@pytest.fixture(autouse=True)
+def clear_google_client_cache():
+    """Сбрасывает общий кэш credentials и клиентов gspread между тестами"""
+    _load_credentials.cache_clear()
+    _get_gspread_client.cache_clear()
+    yield
+    _load_credentials.cache_clear()
+    _get_gspread_client.cache_clear()
+
+
 class TestGoogleSheetsExporterSimple:
     """Упрощенные тесты для GoogleSheetsExporter"""
     
@@ -46,13 +61,11 @@ class TestGoogleSheetsExporterSimple:
         
         return [item1]
     
-    @patch('src.services.news.exporter.os.path.exists')
     @patch('src.services.news.exporter.get_google_settings')
     @patch('src.services.news.exporter.gspread.authorize')
     @patch('src.services.news.exporter.Credentials.from_service_account_file')
-    def test_init_success(self, mock_credentials, mock_authorize, mock_get_settings, mock_exists, mock_google_settings):
+    def test_init_success(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
         """Тест успешной инициализации экспортера"""
-        mock_exists.return_value = True
         mock_get_settings.return_value = mock_google_settings
         mock_client = Mock()
         mock_authorize.return_value = mock_client
@@ -64,24 +77,38 @@ class TestGoogleSheetsExporterSimple:
         assert exporter.max_retries == 3
         assert exporter.retry_delay == 1.0
         assert exporter._client == mock_client
+        # Атрибуты хранятся в __slots__, без __dict__ на экземпляр
+        assert not hasattr(exporter, "__dict__")
     
-    @patch('src.services.news.exporter.os.path.exists')
     @patch('src.services.news.exporter.get_google_settings')
-    def test_init_file_not_found(self, mock_get_settings, mock_exists, mock_google_settings):
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_client_shared_between_exporters(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест: credentials и клиент gspread создаются один раз для нескольких экспортеров"""
+        mock_get_settings.return_value = mock_google_settings
+
+        first = GoogleSheetsExporter()
+        second = GoogleSheetsExporter(worksheet_name="Other")
+
+        assert first._client is second._client
+        assert mock_credentials.call_count == 1
+        assert mock_authorize.call_count == 1
+
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_init_file_not_found(self, mock_credentials, mock_get_settings, mock_google_settings):
         """Тест инициализации когда файл service account не найден"""
-        mock_exists.return_value = False
+        mock_credentials.side_effect = FileNotFoundError(2, "No such file or directory")
         mock_get_settings.return_value = mock_google_settings
         
         with pytest.raises(AuthenticationError, match="Google service account file not found"):
             GoogleSheetsExporter()
     
-    @patch('src.services.news.exporter.os.path.exists')
     @patch('src.services.news.exporter.get_google_settings')
     @patch('src.services.news.exporter.gspread.authorize')
     @patch('src.services.news.exporter.Credentials.from_service_account_file')
-    def test_prepare_export_data(self, mock_credentials, mock_authorize, mock_get_settings, mock_exists, mock_google_settings, sample_news_items):
+    def test_prepare_export_data(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings, sample_news_items):
         """Тест подготовки данных для экспорта"""
-        mock_exists.return_value = True
         mock_get_settings.return_value = mock_google_settings
         mock_client = Mock()
         mock_authorize.return_value = mock_client
@@ -105,17 +132,256 @@ class TestGoogleSheetsExporterSimple:
         assert row1[13] == "0.95"  # Similarity Score
         assert row1[14] == "No"  # Is Duplicate
 
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_prepare_export_data_single_timestamp(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings, sample_news_items):
+        """Тест: все строки выгрузки получают одинаковые Timestamp и Processing Date"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_authorize.return_value = Mock()
+        second = NewsItem(title="Test News 2", description="", url="http://example.com/2", published_at=None, source="Test Source")
+
+        exporter = GoogleSheetsExporter()
+        rows_data = exporter._prepare_export_data(sample_news_items + [second])
+
+        assert len(rows_data) == 2
+        assert rows_data[0][0] == rows_data[1][0]
+        assert rows_data[0][16] == rows_data[1][16]
+        assert rows_data[0][16].endswith(" UTC")
+        assert rows_data[1][5] == ""  # Published At
+
+
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_overwrite_data_single_batch_update(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест перезаписи данных одним запросом batchUpdate"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_authorize.return_value = Mock()
+
+        worksheet = Mock()
+        worksheet.id = 42
+        worksheet.row_count = 2
+
+        exporter = GoogleSheetsExporter()
+        exporter._overwrite_data(worksheet, [["a", "1"], ["b", "2"]])
+
+        worksheet.spreadsheet.batch_update.assert_called_once()
+        requests = worksheet.spreadsheet.batch_update.call_args.args[0]["requests"]
+        assert requests[0] == {
+            "updateCells": {
+                "range": {"sheetId": 42, "startRowIndex": 1, "endRowIndex": 2},
+                "fields": "userEnteredValue"
+            }
+        }
+        assert requests[1] == {"appendDimension": {"sheetId": 42, "dimension": "ROWS", "length": 1}}
+        assert requests[2]["updateCells"]["start"] == {"sheetId": 42, "rowIndex": 1, "columnIndex": 0}
+        assert requests[2]["updateCells"]["rows"][1] == {
+            "values": [{"userEnteredValue": {"stringValue": "b"}}, {"userEnteredValue": {"stringValue": "2"}}]
+        }
+        worksheet.delete_rows.assert_not_called()
+        worksheet.insert_rows.assert_not_called()
+        assert exporter._row_count == 3
+
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_worksheet_metadata_cached(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест: метаданные листа запрашиваются один раз до invalidate_metadata"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_client = Mock()
+        mock_authorize.return_value = mock_client
+        worksheet = mock_client.open_by_key.return_value.worksheet.return_value
+        worksheet.id = 7
+        worksheet.row_count = 100
+
+        exporter = GoogleSheetsExporter()
+        assert exporter._get_worksheet() is exporter._get_worksheet()
+        worksheet.row_count = 500
+
+        assert exporter.get_export_summary()["total_rows"] == 100
+        assert mock_client.open_by_key.call_count == 1
+
+        exporter.invalidate_metadata()
+
+        assert exporter.get_export_summary()["total_rows"] == 500
+        assert mock_client.open_by_key.call_count == 2
+
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_new_worksheet_headers_written_once(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест: заголовки нового листа пишутся одним update в первую строку и повторяются после сбоя"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_client = Mock()
+        mock_authorize.return_value = mock_client
+        spreadsheet = mock_client.open_by_key.return_value
+        spreadsheet.worksheet.side_effect = WorksheetNotFound("News")
+        worksheet = spreadsheet.add_worksheet.return_value
+        worksheet.update.side_effect = [Exception("write failed"), {}]
+
+        exporter = GoogleSheetsExporter()
+        with pytest.raises(GoogleSheetsExportError):
+            exporter._get_worksheet()
+        exporter._get_worksheet()
+        exporter._get_worksheet()
+
+        assert worksheet.update.call_count == 2
+        headers, range_name = worksheet.update.call_args.args
+        assert range_name == "A1:Q1"
+        assert headers[0][0] == "Timestamp" and len(headers[0]) == 17
+        assert worksheet.update.call_args.kwargs == {"value_input_option": "RAW"}
+        worksheet.insert_row.assert_not_called()
+        assert spreadsheet.add_worksheet.call_count == 1
+
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_export_summary_refreshes_after_ttl(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест: get_export_summary перечитывает метаданные только по истечении TTL"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_client = Mock()
+        mock_authorize.return_value = mock_client
+        worksheet = mock_client.open_by_key.return_value.worksheet.return_value
+        worksheet.row_count = 100
+
+        exporter = GoogleSheetsExporter(metadata_ttl=30.0)
+        with patch('src.services.news.exporter.time.monotonic', return_value=1000.0):
+            exporter._get_worksheet()
+        worksheet.row_count = 500
+
+        with patch('src.services.news.exporter.time.monotonic', return_value=1029.0):
+            assert exporter.get_export_summary()["total_rows"] == 100
+        with patch('src.services.news.exporter.time.monotonic', return_value=1030.0):
+            assert exporter.get_export_summary()["total_rows"] == 500
+        assert mock_client.open_by_key.call_count == 2
+
+    @patch('src.services.news.exporter.MAX_PAYLOAD_BYTES', 40)
+    @patch('src.services.news.exporter.get_google_settings')
+    @patch('src.services.news.exporter.gspread.authorize')
+    @patch('src.services.news.exporter.Credentials.from_service_account_file')
+    def test_append_rows_split_by_payload_size(self, mock_credentials, mock_authorize, mock_get_settings, mock_google_settings):
+        """Тест: большая выгрузка добавляется несколькими запросами в соседние диапазоны"""
+        mock_get_settings.return_value = mock_google_settings
+        mock_authorize.return_value = Mock()
+
+        worksheet = Mock()
+        worksheet.row_count = 1000
+        worksheet.col_values.return_value = ["Timestamp", "row"]
+        rows = [["aaaaa", "bbbbb"], ["ccccc", "ddddd"], ["eeeee", "fffff"]]
+
+        exporter = GoogleSheetsExporter()
+        exporter._append_rows(worksheet, rows)
+
+        assert [c.args for c in worksheet.update.call_args_list] == [
+            (rows[:2], "A3:B4"),
+            (rows[2:], "A5:B5")
+        ]
+        for call in worksheet.update.call_args_list:
+            assert call.kwargs == {"value_input_option": "RAW"}
+
+
+class TestRetryWithBackoff:
+    """Тесты классификации ошибок в _retry_with_backoff"""
+
+    @pytest.fixture
+    def exporter(self):
+        """Экспортер с замоканными настройками и клиентом"""
+        mock_settings = Mock()
+        mock_settings.GOOGLE_SHEET_ID = "test_spreadsheet_id"
+        mock_settings.GOOGLE_SERVICE_ACCOUNT_PATH = "/test/path/service_account.json"
+        with patch('src.services.news.exporter.get_google_settings', return_value=mock_settings), \
+             patch('src.services.news.exporter.gspread.authorize'), \
+             patch('src.services.news.exporter.Credentials.from_service_account_file'):
+            return GoogleSheetsExporter(max_retries=3, retry_delay=1.0)
+
+    @staticmethod
+    def _api_error(status_code: int) -> APIError:
+        response = Mock(status_code=status_code)
+        response.json.return_value = {"error": {"code": status_code, "message": "error", "status": "ERROR"}}
+        return APIError(response)
+
+    def test_quota_error_retried_with_full_jitter(self, exporter):
+        """Тест: 429 повторяется с задержкой из [0, retry_delay * 2^attempt]"""
+        func = Mock(side_effect=[self._api_error(429), self._api_error(429), "ok"])
+
+        with patch('src.services.news.exporter.time.sleep') as mock_sleep, \
+             patch('src.services.news.exporter.random.uniform', side_effect=lambda low, high: high / 2) as mock_uniform:
+            assert exporter._retry_with_backoff(func) == "ok"
+
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    def test_quota_exceeded_after_all_attempts(self, exporter):
+        """Тест: после исчерпания попыток 429 превращается в QuotaExceededError"""
+        func = Mock(side_effect=self._api_error(429))
+
+        with patch('src.services.news.exporter.time.sleep'):
+            with pytest.raises(QuotaExceededError):
+                exporter._retry_with_backoff(func)
+
+        assert func.call_count == 4
+
+    def test_server_error_retried(self, exporter):
+        """Тест: ошибки 5xx повторяются"""
+        func = Mock(side_effect=[self._api_error(503), "ok"])
+
+        with patch('src.services.news.exporter.time.sleep') as mock_sleep:
+            assert exporter._retry_with_backoff(func) == "ok"
+
+        assert mock_sleep.call_count == 1
+
+    def test_auth_error_not_retried(self, exporter):
+        """Тест: 401/403 сразу дают AuthenticationError без повторов"""
+        func = Mock(side_effect=self._api_error(403))
+
+        with patch('src.services.news.exporter.time.sleep') as mock_sleep:
+            with pytest.raises(AuthenticationError):
+                exporter._retry_with_backoff(func)
+
+        assert func.call_count == 1
+        assert mock_sleep.call_count == 0
+
+    def test_message_text_does_not_affect_classification(self, exporter):
+        """Тест: текст ошибки со словом quota не делает ее ошибкой квоты"""
+        func = Mock(side_effect=ValueError("quota field is invalid"))
+
+        with patch('src.services.news.exporter.time.sleep'):
+            with pytest.raises(GoogleSheetsExportError) as exc_info:
+                exporter._retry_with_backoff(func)
+
+        assert not isinstance(exc_info.value, QuotaExceededError)
+        assert func.call_count == 3
+
+
+class TestChunkByPayloadSize:
+    """Тесты для _chunk_by_payload_size"""
+
+    def test_chunks_respect_max_bytes(self):
+        """Тест: размер каждой пачки не превышает лимит, порядок строк сохраняется"""
+        rows = [["новость", str(i)] for i in range(10)]
+
+        chunks = list(_chunk_by_payload_size(rows, 60))
+
+        assert [row for chunk in chunks for row in chunk] == rows
+        assert len(chunks) > 1
+        assert all(len(chunk) for chunk in chunks)
+
+    def test_oversized_row_goes_alone(self):
+        """Тест: строка больше лимита уходит отдельной пачкой"""
+        rows = [["a"], ["x" * 100], ["b"]]
+
+        assert list(_chunk_by_payload_size(rows, 20)) == [[["a"]], [["x" * 100]], [["b"]]]
+
 
 class TestCreateGoogleSheetsExporter:
     """Тесты для create_google_sheets_exporter"""
     
-    @patch('src.services.news.exporter.os.path.exists')
     @patch('src.services.news.exporter.get_google_settings')
     @patch('src.services.news.exporter.gspread.authorize')
     @patch('src.services.news.exporter.Credentials.from_service_account_file')
-    def test_create_exporter_defaults(self, mock_credentials, mock_authorize, mock_get_settings, mock_exists):
+    def test_create_exporter_defaults(self, mock_credentials, mock_authorize, mock_get_settings):
         """Тест создания экспортера с настройками по умолчанию"""
-        mock_exists.return_value = True
         mock_settings = Mock()
         mock_settings.GOOGLE_SHEET_ID = "test_id"
         mock_settings.GOOGLE_SERVICE_ACCOUNT_PATH = "/test/path/service_account.json"
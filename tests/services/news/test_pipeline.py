@@ -1,5 +1,6 @@
 # /tests/services/news/test_pipeline.py
 
+import threading
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from typing import List, Dict, Any
@@ -216,4 +217,31 @@ class TestNewsPipelineOrchestrator:
             assert orchestrator.worksheet_name == "CustomSheet"
             assert orchestrator._fetcher is None
             assert orchestrator._news_chain is None
-            assert orchestrator._exporter is None 
\ No newline at end of file
+            assert orchestrator._exporter is None
+    @patch('src.services.news.pipeline.create_news_fetcher_from_config')
+    def test_fetch_stage_requests_run_in_parallel(self, mock_create_fetcher, orchestrator):
+        """Тест: запросы к провайдерам выполняются параллельно, ответы разбираются по порядку"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch_news(url, params):
+            # Оба запроса должны одновременно дойти до барьера
+            barrier.wait()
+            if url == "https://b":
+                raise RuntimeError("provider down")
+            return {"articles": [{"title": "Title", "url": "https://a/1", "published_at": "2024-01-01T00:00:00Z"}]}
+
+        mock_create_fetcher.return_value.fetch_news.side_effect = fetch_news
+        config_requests = [
+            {"provider": "a", "url": "https://a"},
+            {"provider": "b", "url": "https://b"},
+            {"provider": "c"}
+        ]
+
+        result = orchestrator._run_fetch_stage(config_requests)
+
+        assert result.success is True
+        assert result.data["articles_count"] == 1
+        assert result.data["successful_requests"] == 1
+        assert result.data["failed_requests"] == 2
+        assert "provider down" in result.data["warnings"][0]
+        assert mock_create_fetcher.call_count == 2
@@ -2,11 +2,13 @@
 
 import pytest
 import os
+import copy
 from unittest.mock import patch, MagicMock
 from pydantic import ValidationError
+import src.config as src_config
 from src.config import (
     get_settings, get_news_providers_settings, get_ai_settings, get_google_settings,
-    get_log_level, is_debug_mode,
+    get_log_level, is_debug_mode, reset_settings_cache,
     Settings, BaseProviderSettings, TheNewsAPISettings, NewsAPISettings, NewsDataIOSettings,
     MediaStackSettings, GNewsIOSettings, NewsProvidersSettings, AISettings, GoogleSettings
 )
@@ -93,6 +95,14 @@ class TestBaseProviderSettings:
         assert settings.timeout == 30
 
 
+    def test_base_provider_settings_frozen(self):
+        """Тест неизменяемости настроек провайдера после создания"""
+        settings = BaseProviderSettings()
+
+        with pytest.raises(ValidationError):
+            settings.enabled = False
+
+
 class TestTheNewsAPISettings:
     """Тесты для настроек TheNewsAPI"""
     
@@ -281,6 +291,112 @@ class TestNewsProvidersSettings:
         assert sorted_providers[0][0] == "newsapi"  # priority 1
         assert sorted_providers[1][0] == "thenewsapi"  # priority 2
 
+    def test_providers_resolved_by_provider_kind(self):
+        """Тест выбора класса настроек провайдера по provider_kind"""
+        settings = NewsProvidersSettings(providers={
+            "gnews": {"provider_kind": "gnews_io", "api_key": "test_key"},
+            "mediastack": {"provider_kind": "mediastack_com", "access_key": "test_key"}
+        })
+
+        assert isinstance(settings.providers["gnews"], GNewsIOSettings)
+        assert isinstance(settings.providers["mediastack"], MediaStackSettings)
+
+    def test_frozen_settings_keep_private_caches(self):
+        """Тест: замороженные настройки запрещают присваивание, но кэшируют выборки"""
+        providers = {"thenewsapi": TheNewsAPISettings(api_token="test_token")}
+        settings = NewsProvidersSettings(providers=providers)
+
+        with pytest.raises(ValidationError):
+            settings.default_provider = "newsapi"
+
+        enabled = settings.get_enabled_providers()
+        assert enabled is settings.get_enabled_providers()
+        assert settings.get_providers_by_priority() is settings.get_providers_by_priority()
+
+    def test_enabled_and_priority_results_are_cached(self):
+        """Тест кэширования включенных и отсортированных провайдеров"""
+        providers = {
+            "thenewsapi": TheNewsAPISettings(api_token="test_token", priority=2),
+            "newsapi": NewsAPISettings(api_key="test_key", priority=1)
+        }
+        settings = NewsProvidersSettings(providers=providers)
+
+        assert settings.get_enabled_providers() is settings.get_enabled_providers()
+        assert settings.get_providers_by_priority() is settings.get_providers_by_priority()
+
+
+class TestNewsProvidersSettingsRefresh:
+    """Тесты для фонового обновления настроек провайдеров (stale-while-revalidate)"""
+
+    def setup_method(self):
+        reset_settings_cache()
+
+    def teardown_method(self):
+        reset_settings_cache()
+
+    def test_fresh_settings_do_not_trigger_refresh(self):
+        """Тест отсутствия обновления, пока настройки не устарели"""
+        with patch('src.config._schedule_news_providers_refresh') as mock_schedule:
+            first = get_news_providers_settings()
+            second = get_news_providers_settings()
+
+            assert first is second
+            mock_schedule.assert_not_called()
+
+    def test_stale_settings_returned_while_refresh_scheduled(self):
+        """Тест возврата устаревших настроек с запуском фонового обновления"""
+        stale = get_news_providers_settings()
+
+        with patch('src.config.time.monotonic', return_value=1e12), \
+             patch('src.config.threading.Thread') as mock_thread:
+            assert get_news_providers_settings() is stale
+            assert get_news_providers_settings() is stale
+
+            # Повторный вызов не запускает второй поток, пока идет обновление
+            mock_thread.return_value.start.assert_called_once()
+
+    def test_refresh_swaps_settings(self):
+        """Тест замены настроек после успешного обновления"""
+        stale = get_news_providers_settings()
+
+        with patch.dict(os.environ, {'GNEWS_API_KEY': 'rotated_key'}):
+            src_config._refresh_news_providers_settings()
+
+        refreshed = get_news_providers_settings()
+        assert refreshed is not stale
+        assert refreshed.get_provider_settings("gnews_io").api_key == "rotated_key"
+
+    def test_reset_clears_refreshing_flag(self):
+        """Тест: сброс кэша снимает флаг фонового обновления"""
+        get_news_providers_settings()
+
+        with patch('src.config.time.monotonic', return_value=1e12), \
+             patch('src.config.threading.Thread'):
+            get_news_providers_settings()
+        assert src_config._NEWS_PROVIDERS_REFRESHING is True
+
+        reset_settings_cache()
+        assert src_config._NEWS_PROVIDERS_REFRESHING is False
+
+    def test_refresh_started_before_reset_is_discarded(self):
+        """Тест: обновление, начатое до сброса кэша, не записывает свой результат"""
+        get_news_providers_settings()
+        generation = src_config._NEWS_PROVIDERS_GENERATION
+
+        reset_settings_cache()
+        src_config._refresh_news_providers_settings(generation)
+
+        assert src_config._NEWS_PROVIDERS_SETTINGS is None
+
+    def test_refresh_keeps_stale_settings_on_error(self):
+        """Тест сохранения прежних настроек, если .env не удалось прочитать"""
+        stale = get_news_providers_settings()
+
+        with patch('src.config.Settings', side_effect=Exception(".env unavailable")):
+            src_config._refresh_news_providers_settings()
+
+        assert get_news_providers_settings() is stale
+
 
 class TestAISettings:
     """Тесты для настроек AI"""
@@ -382,7 +498,7 @@ class TestSettingsGetters:
         mock_get_settings.side_effect = Exception("Settings error")
         
         # Очищаем кэш перед тестом
-        get_news_providers_settings.cache_clear()
+        reset_settings_cache()
         
         with patch.dict(os.environ, {
             'THENEWSAPI_API_TOKEN': 'env_token',
@@ -426,7 +542,7 @@ class TestSettingsGetters:
         mock_get_settings.side_effect = Exception("Settings error")
         
         # Очищаем кэш перед тестом
-        get_ai_settings.cache_clear()
+        reset_settings_cache()
         
         with patch.dict(os.environ, {
             'OPENAI_API_KEY': 'env_key',
@@ -462,7 +578,7 @@ class TestSettingsGetters:
         mock_get_settings.side_effect = Exception("Settings error")
         
         # Очищаем кэш перед тестом
-        get_google_settings.cache_clear()
+        reset_settings_cache()
         
         with patch.dict(os.environ, {
             'GOOGLE_SHEET_ID': 'env_sheet_id',
@@ -509,4 +625,42 @@ class TestGetSettings:
             settings2 = get_settings()
             
             # Должны быть одним и тем же объектом благодаря кэшированию
-            assert settings1 is settings2 
\ No newline at end of file
+            assert settings1 is settings2
+
+    def test_reset_settings_cache(self):
+        """Тест сброса кэша настроек"""
+        settings1 = get_settings()
+        reset_settings_cache()
+        settings2 = get_settings()
+
+        # После сброса кэша создается новый объект
+        assert settings1 is not settings2
+        assert get_settings() is settings2
+
+    def test_get_settings_defers_env_parsing(self):
+        """Тест отложенного чтения .env до первого обращения к полю"""
+        reset_settings_cache()
+        with patch('src.config.Settings') as mock_settings_class:
+            mock_settings_class.return_value.OPENAI_API_KEY = "lazy_key"
+            settings = get_settings()
+
+            mock_settings_class.assert_not_called()
+            assert settings.OPENAI_API_KEY == "lazy_key"
+            assert settings.OPENAI_API_KEY == "lazy_key"
+            mock_settings_class.assert_called_once()
+        reset_settings_cache()
+
+    def test_lazy_settings_proxy_behaves_like_settings(self):
+        """Тест делегирования repr, load() и копирования прокси настроек"""
+        reset_settings_cache()
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'proxy_key'}):
+            settings = get_settings()
+
+            assert isinstance(settings.load(), Settings)
+            assert settings.load() is settings.load()
+            assert repr(settings) == repr(settings.load())
+
+            # Копия без __init__ не должна уходить в рекурсию
+            copied = copy.copy(settings)
+            assert copied.OPENAI_API_KEY == "proxy_key"
+        reset_settings_cache()
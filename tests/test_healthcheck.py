@@ -122,17 +122,43 @@ class TestCheckDependencies:
     
     def test_check_dependencies_success(self):
         """Тест успешной проверки зависимостей."""
-        with patch('builtins.__import__') as mock_import:
+        with patch('src.healthcheck.importlib.util.find_spec') as mock_find_spec:
+            mock_find_spec.return_value = MagicMock()
             result = check_dependencies()
             assert result is True
     
     def test_check_dependencies_import_error(self):
         """Тест проверки зависимостей с ошибкой импорта."""
-        with patch('builtins.__import__') as mock_import:
-            mock_import.side_effect = ImportError("Module not found")
+        with patch('src.healthcheck.importlib.util.find_spec') as mock_find_spec, \
+             patch('src.healthcheck.sys') as mock_sys:
+            mock_sys.modules = {}
+            mock_find_spec.return_value = None
             result = check_dependencies()
             assert result is False
 
+    def test_check_dependencies_skips_find_spec_for_loaded_modules(self):
+        """Тест: для уже загруженных модулей find_spec не вызывается."""
+        with patch('src.healthcheck.importlib.util.find_spec') as mock_find_spec, \
+             patch('src.healthcheck.sys') as mock_sys:
+            mock_sys.modules = {"openai": MagicMock(), "pydantic": MagicMock()}
+            mock_find_spec.return_value = MagicMock()
+            assert check_dependencies() is True
+
+            checked = [call.args[0] for call in mock_find_spec.call_args_list]
+            assert "openai" not in checked
+            assert "pydantic" not in checked
+
+    def test_check_dependencies_blocked_module_is_missing(self):
+        """Тест: модуль с записью None в sys.modules считается отсутствующим."""
+        with patch('src.healthcheck.importlib.util.find_spec') as mock_find_spec, \
+             patch('src.healthcheck.sys') as mock_sys:
+            mock_sys.modules = {"faiss": None}
+            mock_find_spec.side_effect = lambda module: None if module == "faiss" else MagicMock()
+            assert check_dependencies() is False
+
+            checked = [call.args[0] for call in mock_find_spec.call_args_list]
+            assert "faiss" in checked
+
 
 class TestDryRunCheck:
     """Тесты для функции dry_run_check."""
@@ -3,9 +3,10 @@
 import pytest
 import logging
 import tempfile
+from logging.handlers import QueueHandler
 import os
 from unittest.mock import patch, MagicMock
-from src.logger import setup_logger
+from src.logger import setup_logger, _stop_listener
 
 
 class TestSetupLogger:
@@ -31,10 +32,12 @@ class TestSetupLogger:
             assert logger.name == "test_logger_file"
             assert len(logger.handlers) == 2  # console + file
             
-            # Проверяем типы handlers
+            # Проверяем типы handlers: файловый handler работает за очередью
             handler_types = [type(h).__name__ for h in logger.handlers]
             assert "StreamHandler" in handler_types
-            assert "RotatingFileHandler" in handler_types
+            assert "QueueHandler" in handler_types
+            queue_handler = next(h for h in logger.handlers if isinstance(h, QueueHandler))
+            assert [type(h).__name__ for h in queue_handler.listener.handlers] == ["RotatingFileHandler"]
         finally:
             os.unlink(log_file)
     
@@ -85,12 +88,13 @@ class TestSetupLogger:
                 backup_count=3
             )
             
-            # Находим RotatingFileHandler
+            # Находим RotatingFileHandler за QueueHandler
             rotating_handler = None
             for handler in logger.handlers:
-                if hasattr(handler, 'maxBytes'):
-                    rotating_handler = handler
-                    break
+                for target in getattr(getattr(handler, 'listener', None), 'handlers', ()):
+                    if hasattr(target, 'maxBytes'):
+                        rotating_handler = target
+                        break
             
             assert rotating_handler is not None
             assert rotating_handler.maxBytes == 1024
@@ -109,6 +113,51 @@ class TestSetupLogger:
         assert "Test message" in caplog.text
         assert "test_output" in caplog.text
     
+    def test_file_logging_through_queue(self):
+        """Тест записи в файл через фоновый QueueListener."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            log_file = tmp_file.name
+
+        try:
+            logger = setup_logger("test_queued_file", log_file=log_file)
+            logger.info("Queued message")
+
+            queue_handler = next(h for h in logger.handlers if isinstance(h, QueueHandler))
+            _stop_listener(queue_handler.listener)
+
+            with open(log_file, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+            assert len(lines) == 1
+            assert lines[0].endswith(" - test_queued_file - INFO - Queued message")
+        finally:
+            os.unlink(log_file)
+
+    def test_loggers_share_file_listener(self):
+        """Тест: логгеры с одним файлом используют общий слушатель и handler."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            log_file = tmp_file.name
+
+        try:
+            first = setup_logger("test_shared_first", log_file=log_file)
+            second = setup_logger("test_shared_second", log_file=log_file)
+            first.info("First message")
+            second.info("Second message")
+
+            first_handler = next(h for h in first.handlers if isinstance(h, QueueHandler))
+            second_handler = next(h for h in second.handlers if isinstance(h, QueueHandler))
+            assert first_handler is not second_handler
+            assert first_handler.listener is second_handler.listener
+
+            _stop_listener(first_handler.listener)
+            with open(log_file, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+            assert len(lines) == 2
+            assert lines[1].endswith(" - test_shared_second - INFO - Second message")
+        finally:
+            os.unlink(log_file)
+
     def test_setup_logger_without_settings(self):
         """Тест настройки логгера когда настройки недоступны."""
         # Симулируем ситуацию когда get_log_level() недоступен
@@ -150,4 +150,25 @@ class TestNewsModuleIsolation:
         assert thenewsapi_class is not None
         assert newsapi_class is not None
         assert thenewsapi_class.PROVIDER_NAME == "thenewsapi"
-        assert newsapi_class.PROVIDER_NAME == "newsapi" 
\ No newline at end of file
+        assert newsapi_class.PROVIDER_NAME == "newsapi"
+
+    @patch('src.config.get_news_providers_settings')
+    def test_create_fetcher_reuses_instance_for_same_settings(self, mock_get_settings):
+        """Тест: при тех же настройках фабрика возвращает тот же fetcher"""
+        from src.config import TheNewsAPISettings
+
+        FetcherFactory.clear_cache()
+        mock_settings = MagicMock()
+        mock_settings.get_provider_settings.return_value = TheNewsAPISettings(api_token="test_token")
+        mock_get_settings.return_value = mock_settings
+
+        first = create_news_fetcher_from_config("thenewsapi_com")
+        second = create_news_fetcher_from_config("thenewsapi_com")
+
+        # После перезагрузки конфига создается новый fetcher
+        mock_settings.get_provider_settings.return_value = TheNewsAPISettings(api_token="new_token")
+        third = create_news_fetcher_from_config("thenewsapi_com")
+
+        assert first is second
+        assert third is not first
+        assert third.api_token == "new_token"
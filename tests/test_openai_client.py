@@ -1,7 +1,9 @@
 # tests/test_openai_client.py
 
+import asyncio
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import openai
 
 from src.openai_client import OpenAIClient, OpenAIClientError, create_openai_client
@@ -24,7 +26,7 @@ class TestOpenAIClient:
         """Создает экземпляр клиента для тестов"""
         with patch('src.openai_client.get_ai_settings', return_value=mock_settings):
             client = OpenAIClient(max_retries=3, backoff_factor=2.0)
-            client._logger = Mock()  # Мокаем логгер
+            client.logger = Mock()  # Мокаем логгер
             return client
     
     def test_client_initialization_with_api_key(self):
@@ -44,19 +46,77 @@ class TestOpenAIClient:
             assert client.max_retries == 3  # дефолтный
             assert client.backoff_factor == 2.0  # дефолтный
             assert client.client.api_key == "test_api_key"
+
+    def test_default_models_resolved_once(self, mock_settings):
+        """Тест: модели по умолчанию берутся из настроек при инициализации"""
+        mock_settings.OPENAI_MODEL = "gpt-4o"
+        mock_settings.OPENAI_EMBEDDING_MODEL = "text-embedding-3-large"
+
+        with patch('src.openai_client.get_ai_settings', return_value=mock_settings) as mock_get_settings:
+            client = OpenAIClient()
+
+            with patch.object(client.client.chat.completions, 'create') as mock_create:
+                client.create_chat_completion([{"role": "user", "content": "Test"}])
+                client.create_chat_completion([{"role": "user", "content": "Test"}])
+
+            assert mock_create.call_args.kwargs["model"] == "gpt-4o"
+            assert client.default_embedding_model == "text-embedding-3-large"
+            assert mock_get_settings.call_count == 1
+
+    def test_default_models_fallback_without_settings(self):
+        """Тест: без настроек и с явным ключом используются fallback модели"""
+        with patch('src.openai_client.get_ai_settings', side_effect=ValueError("OPENAI_API_KEY is required")):
+            client = OpenAIClient(api_key="explicit_key")
+
+            assert client.default_chat_model == "gpt-4o-mini"
+            assert client.default_embedding_model == "text-embedding-3-small"
+
+            with pytest.raises(ValueError):
+                OpenAIClient()
+
+    def test_client_uses_pooled_http_client(self):
+        """Тест: OpenAI SDK работает через общий пул соединений клиента"""
+        client = OpenAIClient(api_key="explicit_key")
+
+        assert client.client._client is client._http_client
+        pool = client._http_client._transport._pool
+        assert pool._max_keepalive_connections == 20
+        assert pool._max_connections == 100
+
+    def test_client_context_manager_closes_pool(self):
+        """Тест: выход из контекстного менеджера закрывает пул соединений"""
+        with OpenAIClient(api_key="explicit_key") as client:
+            assert not client._http_client.is_closed
+
+        assert client._http_client.is_closed
     
     def test_exponential_backoff_calculation(self, client):
         """Тест расчета экспоненциального backoff"""
-        delay_0 = client._exponential_backoff(0)
-        delay_1 = client._exponential_backoff(1)
-        delay_2 = client._exponential_backoff(2)
-        
-        # Базовая проверка что задержки увеличиваются
-        assert delay_0 < delay_1 < delay_2
+        # Full jitter: задержка равномерно распределена от 0 до base * factor^attempt
+        with patch('src.openai_client.random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            delay_0 = client._exponential_backoff(0)
+            delay_1 = client._exponential_backoff(1)
+            delay_2 = client._exponential_backoff(2)
+
+            assert (delay_0, delay_1, delay_2) == (1.0, 2.0, 4.0)
+            assert all(call.args[0] == 0 for call in mock_uniform.call_args_list)
         
         # Проверяем что не превышает максимум
         delay_large = client._exponential_backoff(10)
-        assert delay_large <= 60.0
+        assert 0 <= delay_large <= 60.0
+
+    def test_retry_delay_respects_retry_after(self, client):
+        """Тест: задержка не меньше Retry-After из ответа сервера"""
+        response = Mock()
+        response.headers = {'retry-after': '7'}
+        rate_limit_error = openai.RateLimitError("Rate limit exceeded", response=response, body=None)
+
+        handled_error = client._handle_openai_error(rate_limit_error, 1)
+
+        assert handled_error.retry_after == 7.0
+        with patch('src.openai_client.random.uniform', return_value=0.5):
+            assert client._retry_delay(handled_error, 0) == 7.0
+            assert client._retry_delay(OpenAIClientError("timeout", status_code=408), 0) == 0.5
     
     def test_handle_openai_error_rate_limit(self, client):
         """Тест обработки ошибки rate limit"""
@@ -179,6 +239,41 @@ class TestOpenAIClient:
             assert mock_create.call_count == 1  # Только одна попытка
             assert mock_sleep.call_count == 0  # Без задержек
     
+    def test_chat_completion_server_error_with_retry(self, client):
+        """Тест: ошибки сервера 5xx повторяются"""
+        mock_response = Mock()
+
+        with patch.object(client.client.chat.completions, 'create') as mock_create, \
+             patch('time.sleep') as mock_sleep:
+
+            mock_create.side_effect = [
+                openai.InternalServerError("Server error", response=Mock(status_code=503), body=None),
+                mock_response
+            ]
+
+            result = client.create_chat_completion([{"role": "user", "content": "Test"}], model="gpt-4o-mini")
+
+            assert result == mock_response
+            assert mock_create.call_count == 2
+            assert mock_sleep.call_count == 1
+
+    def test_retry_stops_at_max_retry_time(self, client):
+        """Тест: повтор не начинается, если задержка выходит за max_retry_time"""
+        client.max_retry_time = 5.0
+
+        with patch.object(client.client.chat.completions, 'create') as mock_create, \
+             patch('time.sleep') as mock_sleep, \
+             patch.object(client, '_exponential_backoff', return_value=10.0):
+
+            mock_create.side_effect = openai.RateLimitError("Rate limit", response=Mock(), body=None)
+
+            with pytest.raises(OpenAIClientError) as exc_info:
+                client.create_chat_completion([{"role": "user", "content": "Test"}], model="gpt-4o-mini")
+
+            assert exc_info.value.status_code == 429
+            assert mock_create.call_count == 1
+            assert mock_sleep.call_count == 0
+
     def test_successful_embeddings_creation(self, client, mock_settings):
         """Тест успешного создания embeddings"""
         mock_response = Mock()
@@ -226,6 +321,27 @@ class TestOpenAIClient:
                 input=texts
             )
     
+    def test_embeddings_batched(self, client):
+        """Тест создания embeddings пачками с сохранением порядка"""
+        def fake_create(model, input):
+            response = Mock()
+            # Возвращаем элементы в обратном порядке, как может сделать API
+            response.data = [
+                Mock(index=i, embedding=[float(text.split()[-1])])
+                for i, text in reversed(list(enumerate(input)))
+            ]
+            return response
+
+        with patch.object(client.client.embeddings, 'create', side_effect=fake_create) as mock_create:
+            texts = [f"text {i}" for i in range(5)]
+
+            result = client.create_embeddings_batched(texts, model="text-embedding-3-small", batch_size=2)
+
+            assert result == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+            assert [c.kwargs["input"] for c in mock_create.call_args_list] == [
+                ["text 0", "text 1"], ["text 2", "text 3"], ["text 4"]
+            ]
+
     def test_embeddings_rate_limit_with_retry(self, client):
         """Тест embeddings с rate limit и успешным retry"""
         mock_response = Mock()
@@ -260,8 +376,90 @@ class TestOpenAIClient:
                 client.create_embeddings(texts, model="text-embedding-3-small")  # Явно указываем модель
             
             assert "connection" in exc_info.value.message.lower()
+            assert isinstance(exc_info.value.__cause__, openai.APIConnectionError)
             assert mock_create.call_count == 3
             assert mock_sleep.call_count == 2
+
+    def test_async_client_created_lazily(self):
+        """Тест: асинхронный клиент создается только при первом обращении"""
+        client = OpenAIClient(api_key="explicit_key")
+
+        assert client._async_client is None
+        assert client.async_client is client.async_client
+        assert client.async_client.api_key == "explicit_key"
+
+        asyncio.run(client.aclose())
+        assert client._http_client.is_closed
+        assert client.async_client._client.is_closed
+
+    def test_async_chat_completion(self, client):
+        """Тест асинхронного chat completion"""
+        mock_response = Mock()
+
+        with patch.object(client.async_client.chat.completions, 'create',
+                          new=AsyncMock(return_value=mock_response)) as mock_create:
+            messages = [{"role": "user", "content": "Test"}]
+
+            result = asyncio.run(client.acreate_chat_completion(messages, model="gpt-4o-mini"))
+
+            assert result == mock_response
+            mock_create.assert_awaited_once_with(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=None
+            )
+
+    def test_async_embeddings_rate_limit_with_retry(self, client):
+        """Тест асинхронных embeddings с rate limit: ожидание через asyncio.sleep"""
+        mock_response = Mock()
+
+        with patch.object(client.async_client.embeddings, 'create', new=AsyncMock()) as mock_create, \
+             patch('asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+             patch('time.sleep') as mock_time_sleep:
+
+            mock_create.side_effect = [
+                openai.RateLimitError("Rate limit", response=Mock(), body=None),
+                mock_response
+            ]
+
+            result = asyncio.run(client.acreate_embeddings("Test text", model="text-embedding-3-small"))
+
+            assert result == mock_response
+            assert mock_create.await_count == 2
+            mock_create.assert_awaited_with(model="text-embedding-3-small", input=["Test text"])
+            assert mock_sleep.await_count == 1
+            assert mock_time_sleep.call_count == 0
+
+    def test_async_requests_limited_by_max_concurrency(self, mock_settings):
+        """Тест: одновременных асинхронных запросов не больше max_concurrency"""
+        with patch('src.openai_client.get_ai_settings', return_value=mock_settings):
+            client = OpenAIClient(max_concurrency=2)
+        client.logger = Mock()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_create(model, input):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock()
+
+        async def run_requests():
+            await asyncio.gather(*(
+                client.acreate_embeddings(f"text {i}", model="text-embedding-3-small")
+                for i in range(5)
+            ))
+
+        with patch.object(client.async_client.embeddings, 'create', side_effect=fake_create):
+            asyncio.run(run_requests())
+
+        assert max_in_flight == 2
+        pool = client.async_client._client._transport._pool
+        assert pool._max_keepalive_connections == 2
+        assert pool._max_connections == 4
     
     def test_create_openai_client_convenience_function(self):
         """Тест удобной функции create_openai_client"""
@@ -276,4 +474,15 @@ class TestOpenAIClient:
         assert client.max_retries == 5
         assert client.backoff_factor == 1.5
         assert client.timeout == 30
-        assert client.client.api_key == "test_key" 
\ No newline at end of file
+        assert client.client.api_key == "test_key"
+
+    def test_create_openai_client_returns_shared_client(self):
+        """Тест: create_openai_client переиспользует клиент с теми же параметрами"""
+        create_openai_client.cache_clear()
+        try:
+            first = create_openai_client(api_key="shared_key", timeout=30)
+
+            assert create_openai_client(api_key="shared_key", timeout=30) is first
+            assert create_openai_client(api_key="other_key", timeout=30) is not first
+        finally:
+            create_openai_client.cache_clear()